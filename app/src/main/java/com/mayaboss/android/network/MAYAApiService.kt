@@ -10,8 +10,10 @@ import retrofit2.Retrofit
 import retrofit2.converter.gson.GsonConverterFactory
 import retrofit2.http.Body
 import retrofit2.http.GET
+import retrofit2.http.Header
 import retrofit2.http.POST
 import retrofit2.http.Query
+import retrofit2.http.Streaming
 
 // Data models for API requests
 data class ProposalDecisionRequest(val proposal_id: String)
@@ -34,6 +36,10 @@ interface MAYAApiService {
     @GET("agents/logs")
     suspend fun getLogs(): Response<LogResponse>
 
+    @Streaming
+    @GET("agents/logs/stream")
+    suspend fun streamLogs(@Header("Last-Event-ID") lastEventId: String?): ResponseBody
+
     // Treasury
     @GET("treasury")
     suspend fun getTreasury(): Response<Treasury>
@@ -9,7 +9,10 @@ import com.mayaboss.android.network.MAYAApiService
 import com.mayaboss.android.network.ProposalDecisionRequest
 import com.mayaboss.android.network.WalletConnectRequest
 import com.mayaboss.android.network.WalletSessionResponse // From MAYAApiService.kt
+import kotlinx.coroutines.CancellationException
+import kotlinx.coroutines.Dispatchers
 import kotlinx.coroutines.delay
+import kotlinx.coroutines.isActive
 import kotlinx.coroutines.flow.MutableStateFlow
 import kotlinx.coroutines.flow.StateFlow
 import kotlinx.coroutines.launch
@@ -18,6 +21,11 @@ import retrofit2.Response
 
 class MAYAViewModel(application: Application) : AndroidViewModel(application) {
 
+    companion object {
+        private const val MAX_LOG_LINES = 50
+        private const val LOG_RECONNECT_DELAY_MS = 3000L
+    }
+
     private val api: MAYAApiService = MAYAApiService.create("http://192.168.0.103:8000/")
 
     private val _proposals = MutableStateFlow<List<Proposal>>(emptyList())
@@ -31,7 +39,7 @@ class MAYAViewModel(application: Application) : AndroidViewModel(application) {
 
     init {
         loadPendingProposals()
-        startLogPolling()
+        startLogStream()
     }
 
     fun loadPendingProposals() {
@@ -84,20 +92,29 @@ class MAYAViewModel(application: Application) : AndroidViewModel(application) {
         }
     }
 
-    private fun startLogPolling() {
-        viewModelScope.launch {
-            while (true) {
+    private fun startLogStream() {
+        viewModelScope.launch(Dispatchers.IO) {
+            var lastEventId: String? = null
+            while (isActive) {
                 try {
-                    val response = api.getLogs()
-                    if (response.isSuccessful) {
-                        _logs.value = response.body()?.logs ?: emptyList()
-                    } else {
-                        Timber.e("Failed to get logs: ${response.errorBody()?.string()}")
+                    // Server-Sent Events: only new lines arrive; reconnects resume after lastEventId
+                    api.streamLogs(lastEventId).use { body ->
+                        val source = body.source()
+                        while (isActive) {
+                            val line = source.readUtf8Line() ?: break
+                            when {
+                                line.startsWith("id: ") -> lastEventId = line.removePrefix("id: ")
+                                line.startsWith("data: ") ->
+                                    _logs.value = (_logs.value + line.removePrefix("data: ")).takeLast(MAX_LOG_LINES)
+                            }
+                        }
                     }
+                } catch (e: CancellationException) {
+                    throw e
                 } catch (e: Exception) {
-                    Timber.e(e, "Error getting logs")
+                    Timber.e(e, "Log stream interrupted")
                 }
-                delay(10000) // Poll every 10 seconds
+                delay(LOG_RECONNECT_DELAY_MS)
             }
         }
     }
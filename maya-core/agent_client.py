@@ -0,0 +1,89 @@
+import asyncio
+import json
+from typing import Any, Optional
+
+import aiohttp
+
+from singleflight import SingleFlight
+
+# --- Configuration ---
+AGENT_TIMEOUT_SECS = 3.0      # Per-request budget for a single agent call
+AGENT_RETRIES = 2             # Extra attempts after the first failure
+AGENT_RETRY_BACKOFF_SECS = 0.1
+AGENT_POOL_SIZE = 100         # Max open keep-alive connections across all agents
+AGENT_KEEPALIVE_SECS = 30.0
+
+
+class AgentUnreachable(Exception):
+    """Raised when an agent could not be reached after every retry."""
+
+
+class AgentClient:
+    """The Chancellor's courier: one pooled, keep-alive HTTP session shared by every agent call."""
+
+    def __init__(
+        self,
+        timeout: float = AGENT_TIMEOUT_SECS,
+        retries: int = AGENT_RETRIES,
+        pool_size: int = AGENT_POOL_SIZE,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.pool_size = pool_size
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.flight = SingleFlight("agents")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # The session must be created inside the running event loop, so it is built lazily.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=AGENT_KEEPALIVE_SECS,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get_json(self, base_url: str, path: str, timeout: Optional[float] = None) -> Any:
+        """GET `path` from the agent at `base_url`, retrying transport failures with backoff.
+
+        Raises AgentUnreachable once retries are exhausted and ValueError if the body is not JSON.
+        A GET of a URL that is already in flight waits for that request (and its timeout)
+        instead of sending another.
+        """
+        url = base_url.rstrip("/") + path
+        return await self.flight.do(url, lambda: self._request_json("GET", base_url, path, timeout))
+
+    async def post_json(self, base_url: str, path: str, timeout: Optional[float] = None) -> Any:
+        """POST to `path` with no body; same retries and errors as get_json."""
+        return await self._request_json("POST", base_url, path, timeout)
+
+    async def _request_json(self, method: str, base_url: str, path: str, timeout: Optional[float]) -> Any:
+        session = self._get_session()
+        url = base_url.rstrip("/") + path
+        client_timeout = aiohttp.ClientTimeout(total=timeout if timeout is not None else self.timeout)
+        last_error: Optional[Exception] = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(AGENT_RETRY_BACKOFF_SECS * (2 ** (attempt - 1)))
+            try:
+                async with session.request(method, url, timeout=client_timeout) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+                continue
+            try:
+                return json.loads(body)
+            except Exception as e:
+                raise ValueError(f"Invalid JSON from {url}: {e}") from e
+        raise AgentUnreachable(f"{url}: {last_error!r}")
+
+    async def get_logs(self, base_url: str, since: Optional[int] = None, timeout: Optional[float] = None) -> Any:
+        """The agent's recent `/log` tail, or only lines after byte offset `since` (a previous `cursor`)."""
+        path = "/log" if since is None else f"/log?since={since}"
+        return await self.get_json(base_url, path, timeout=timeout)
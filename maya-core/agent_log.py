@@ -0,0 +1,405 @@
+"""The agent's append-only log: rotation with gzip archives, tail and cursor readers.
+
+Cursors are global byte offsets across the whole history of the log. Rotated segments are
+named `<path>.<start>-<end>[.gz]` after the offsets they cover, so a cursor keeps working
+after the file it pointed into has been rotated and compressed.
+
+Records are JSON lines: `{"ts": <epoch ms>, "event": ..., "amount": ..., "wallet": ..., "msg": ...}`.
+A sparse sidecar index `<path>.idx` maps timestamps to global offsets for time-range reads.
+Plain `[ctime] message` lines written by older agents are still understood.
+"""
+import atexit
+import bisect
+import collections
+import glob
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from log_records import record_ts
+
+TAIL_BLOCK_BYTES = 64 * 1024     # Read size when walking backwards from EOF
+CHUNK_BYTES = 256 * 1024         # Most a single read_since call returns; callers page with the cursor
+
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024))   # Rotate past this size...
+LOG_MAX_AGE_SECS = float(os.environ.get("LOG_MAX_AGE_SECS", 24 * 3600))  # ...or once the file is this old
+LOG_KEEP = int(os.environ.get("LOG_KEEP", 5))                            # Archived segments retained
+LOG_FLUSH_SECS = float(os.environ.get("LOG_FLUSH_SECS", 0.2))            # Longest a record waits in the buffer
+LOG_FSYNC = os.environ.get("LOG_FSYNC", "batch")                         # "batch": one fsync per flush; "none"
+LOG_MAX_BATCH = 1000                                                     # Records per flush at most
+LOG_ARCHIVE_TAIL_LINES = 1000     # Last lines of each compressed segment also kept plain in `<segment>.tail`
+LOG_INDEX_EVERY_BYTES = 64 * 1024  # Sidecar index granularity: one (ts, offset) entry per this much log
+
+_SEGMENT_RE = re.compile(r"\.(\d+)-(\d+)(\.gz)?$")
+
+
+def record(event: str, message: str, amount: Optional[float] = None, wallet: Optional[str] = None) -> str:
+    """One JSONL log record, newline included, stamped with the current time in epoch ms."""
+    fields = {"ts": int(time.time() * 1000), "event": event}
+    if amount is not None:
+        fields["amount"] = amount
+    if wallet is not None:
+        fields["wallet"] = wallet
+    fields["msg"] = message
+    return json.dumps(fields, ensure_ascii=False) + "\n"
+
+
+def tail_lines(path: str, n: int) -> Tuple[List[str], int]:
+    """The last `n` complete lines of `path` and the offset just past them, reading backwards
+    in blocks. A half-written last line is left for the next read, as in `read_since`.
+
+    Cost depends on `n` and line length only, not on how large the file has grown.
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        blocks: List[bytes] = []
+        newlines = 0
+        # One newline more than `n` guarantees the oldest returned line is complete.
+        while pos > 0 and newlines <= n:
+            size = min(TAIL_BLOCK_BYTES, pos)
+            pos -= size
+            f.seek(pos)
+            block = f.read(size)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+    data = b"".join(reversed(blocks))
+    complete = data.rfind(b"\n") + 1  # Never hand out a half-written line; the cursor stops before it
+    lines = data[:complete].splitlines()[-n:] if n > 0 else []
+    return [line.decode("utf-8", "replace").strip() for line in lines], pos + complete
+
+
+def _complete_lines(chunk: bytes, limit: int) -> Tuple[List[str], int, bool]:
+    end = chunk.rfind(b"\n") + 1  # Never hand out a half-written line
+    lines = chunk[:end].decode("utf-8", "replace").splitlines()
+    more = len(chunk) == limit and end > 0  # Stopped at the chunk limit, not at the end
+    return [line.strip() for line in lines], end, more
+
+
+def read_since(path: str, since: int) -> Tuple[List[str], int, bool]:
+    """Complete lines appended after byte offset `since`: (lines, new cursor, more waiting)."""
+    with open(path, "rb") as f:
+        if since < 0 or since > os.fstat(f.fileno()).st_size:
+            since = 0  # The file was truncated or replaced under the caller; start over
+        f.seek(since)
+        chunk = f.read(CHUNK_BYTES)
+    lines, end, more = _complete_lines(chunk, CHUNK_BYTES)
+    return lines, since + end, more
+
+
+def segments(path: str) -> List[Tuple[int, int, str]]:
+    """Archived segments of `path` as (start, end, file), oldest first."""
+    found = {}
+    for name in glob.glob(glob.escape(path) + ".*-*"):
+        match = _SEGMENT_RE.search(name[len(path):])
+        if not match:
+            continue
+        key = (int(match.group(1)), int(match.group(2)))
+        # While a segment is being compressed both files exist; the plain one is complete.
+        if key not in found or not match.group(3):
+            found[key] = name
+    return [(start, end, found[(start, end)]) for start, end in sorted(found)]
+
+
+def _active_base(archived: List[Tuple[int, int, str]]) -> int:
+    """Global offset of the active file's first byte, given the archived segments."""
+    return archived[-1][1] if archived else 0
+
+
+def _open_segment(name: str):
+    return gzip.open(name, "rb") if name.endswith(".gz") else open(name, "rb")
+
+
+def _plain_name(name: str) -> str:
+    return name[:-3] if name.endswith(".gz") else name
+
+
+def _segment_tail(name: str, n: int) -> List[str]:
+    """The last `n` lines of an archived segment, without decompressing it when avoidable."""
+    if not name.endswith(".gz"):
+        return tail_lines(name, n)[0]
+    sidecar = _plain_name(name) + ".tail"
+    if n <= LOG_ARCHIVE_TAIL_LINES and os.path.exists(sidecar):
+        return tail_lines(sidecar, n)[0]
+    # More than the sidecar holds, or an archive from before sidecars: stream, keeping only n.
+    with gzip.open(name, "rb") as f:
+        return [line.decode("utf-8", "replace").strip() for line in collections.deque(f, maxlen=n)]
+
+
+class RotatingLog:
+    """Append-only log file rotated by size and age, with compressed, count-limited archives."""
+
+    def __init__(self, path: str, max_bytes: int = LOG_MAX_BYTES, max_age_secs: float = LOG_MAX_AGE_SECS, keep: int = LOG_KEEP):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_secs = max_age_secs
+        self.keep = max(1, keep)
+        self._lock = threading.Lock()
+        archived = segments(path)
+        self.base = _active_base(archived)  # Global offset of the active file's first byte
+        # The active file was started when the newest segment was archived, so short-lived
+        # writers (like faucet_harvester.py) still age out files across runs.
+        self._opened_at = os.path.getmtime(archived[-1][2]) if archived else time.time()
+        self.index_path = path + ".idx"
+        self._index_ts: List[int] = []
+        self._index_offsets: List[int] = []
+        self._load_index()
+
+    def _load_index(self):
+        end = self.base + (os.path.getsize(self.path) if os.path.exists(self.path) else 0)
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    ts, _, offset = line.partition(" ")
+                    try:
+                        ts, offset = int(ts), int(offset)
+                    except ValueError:
+                        continue  # Torn last entry from a crash
+                    # Entries past the end of the log belong to a log that has since been deleted.
+                    if offset <= end and (not self._index_offsets or offset > self._index_offsets[-1]):
+                        self._index_ts.append(ts)
+                        self._index_offsets.append(offset)
+        except FileNotFoundError:
+            pass
+
+    def _maybe_index(self, offset: int, text: str):
+        if self._index_offsets and offset - self._index_offsets[-1] < LOG_INDEX_EVERY_BYTES:
+            return
+        ts = record_ts(text[:text.find("\n")])
+        if ts is None or (self._index_ts and ts < self._index_ts[-1]):
+            return  # Only stamped, non-decreasing entries keep the index searchable
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(f"{ts} {offset}\n")
+        self._index_ts.append(ts)
+        self._index_offsets.append(offset)
+
+    def write(self, text: str, fsync: bool = False):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                self._maybe_index(self.base + f.seek(0, os.SEEK_END), text)
+                f.write(text)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+                size = f.tell()
+            if size >= self.max_bytes or time.time() - self._opened_at >= self.max_age_secs:
+                self._rotate()
+
+    def rotate(self):
+        with self._lock:
+            self._rotate()
+
+    def _rotate(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        self._opened_at = time.time()
+        if not size:
+            return
+        start, end = self.base, self.base + size
+        archived = f"{self.path}.{start:012d}-{end:012d}"
+        os.replace(self.path, archived)
+        self.base = end
+        # Compression happens off the write path; readers use the plain file until it is done.
+        threading.Thread(target=self._compress_and_prune, args=(archived,), daemon=True).start()
+
+    def _compress_and_prune(self, archived: str):
+        # The plain tail is in place before the plain segment goes, so `tail` never has to
+        # decompress a whole segment after a rotation (which every agent start performs).
+        lines, _ = tail_lines(archived, LOG_ARCHIVE_TAIL_LINES)
+        with open(archived + ".tail.tmp", "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in lines)
+        os.replace(archived + ".tail.tmp", archived + ".tail")
+        with open(archived, "rb") as src, gzip.open(archived + ".gz.tmp", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(archived + ".gz.tmp", archived + ".gz")
+        os.remove(archived)
+        archived = segments(self.path)
+        for _, _, name in archived[:-self.keep]:
+            for stale in (name, _plain_name(name) + ".tail"):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass  # Another pruning pass got there first
+        self._prune_index(archived[-self.keep:][0][0])
+
+    def _prune_index(self, oldest: int):
+        """Drop index entries below `oldest`, the first offset still on disk, and rewrite the
+        sidecar, so `<path>.idx` stays as bounded as the archives it points into."""
+        with self._lock:  # Also keeps the writer from appending to the file being replaced
+            drop = bisect.bisect_left(self._index_offsets, oldest)
+            if not drop:
+                return
+            del self._index_ts[:drop]
+            del self._index_offsets[:drop]
+            with open(self.index_path + ".tmp", "w", encoding="utf-8") as f:
+                f.writelines(f"{ts} {offset}\n" for ts, offset in zip(self._index_ts, self._index_offsets))
+            os.replace(self.index_path + ".tmp", self.index_path)
+
+    def tail(self, n: int) -> Tuple[List[str], int]:
+        """The last `n` lines, reaching back into archived segments if the active file is short."""
+        with self._lock:
+            lines, end = tail_lines(self.path, n) if os.path.exists(self.path) else ([], 0)
+            cursor = self.base + end
+        for _, _, name in reversed(segments(self.path)):
+            if len(lines) >= n:
+                break
+            try:
+                older = _segment_tail(name, n - len(lines))
+            except FileNotFoundError:
+                continue  # Pruned or finished compressing while we looked
+            lines = older + lines
+        return lines, cursor
+
+    def read_since(self, since: int) -> Tuple[List[str], int, bool]:
+        """Complete lines after global offset `since`, crossing from archives into the active file."""
+        for _ in range(3):  # A rotation can move the file between listing and reading it
+            try:
+                return self._read_since(since)
+            except FileNotFoundError:
+                continue
+        return [], since, True
+
+    def _read_since(self, since: int) -> Tuple[List[str], int, bool]:
+        with self._lock:
+            # `base` comes from this same listing, not from construction: a reader in another
+            # process (the core reading faucet_harvester.py's log) sees rotations only here.
+            archived = segments(self.path)
+            base = _active_base(archived)
+            if since >= base:
+                if not os.path.exists(self.path):
+                    return [], base, False
+                lines, cursor, more = read_since(self.path, since - base)
+                if _active_base(segments(self.path)) != base:
+                    # Rotated between listing and reading: what was read may be the new file.
+                    raise FileNotFoundError(self.path)
+                # read_since restarts at 0 when the offset is past EOF; map that back to `base`.
+                return lines, base + cursor, more
+        segment = self._segment_for(archived, since)
+        if segment is None:
+            return [], base, True
+        start, end, name = segment
+        since = max(since, start)  # Before the oldest retained segment: resume at what is left
+        with _open_segment(name) as f:
+            f.seek(since - start)
+            chunk = f.read(min(CHUNK_BYTES, end - since))
+        lines, consumed, _ = _complete_lines(chunk, CHUNK_BYTES)
+        return lines, since + consumed, True
+
+    def read_range(self, start_ms: int, end_ms: Optional[int] = None, limit: int = 10000) -> Tuple[List[str], bool]:
+        """Lines stamped within [start_ms, end_ms], oldest first, and whether `limit` cut them short.
+
+        Binary-searches the sidecar index for the last entry at or before `start_ms`, then reads
+        forward from its offset; unstamped lines go with the stamped line they follow.
+        """
+        with self._lock:
+            i = bisect.bisect_right(self._index_ts, start_ms) - 1
+            offset = self._index_offsets[i] if i >= 0 else 0
+        lines: List[str] = []
+        inside = False
+        while True:
+            chunk, cursor, more = self.read_since(offset)
+            for line in chunk:
+                ts = record_ts(line)
+                if ts is not None:
+                    if end_ms is not None and ts > end_ms:
+                        return lines, False
+                    inside = ts >= start_ms
+                if inside:
+                    if len(lines) >= limit:
+                        return lines, True
+                    lines.append(line)
+            if not more or cursor == offset:
+                return lines, False
+            offset = cursor
+
+    @staticmethod
+    def _segment_for(archived: List[Tuple[int, int, str]], since: int) -> Optional[Tuple[int, int, str]]:
+        for segment in archived:
+            if since < segment[1]:
+                return segment
+        return None
+
+
+class LogWriter:
+    """Buffered front end for a RotatingLog: producers enqueue, one thread writes.
+
+    The writer thread gathers whatever arrives within `flush_interval` (up to LOG_MAX_BATCH
+    records) and writes it with a single open/write and, under the "batch" policy, a single
+    fsync, i.e. group commit. `flush()` returns once everything enqueued before it is on disk.
+    """
+
+    def __init__(self, log: RotatingLog, flush_interval: float = LOG_FLUSH_SECS, fsync: str = LOG_FSYNC):
+        if fsync not in ("batch", "none"):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.log = log
+        self.flush_interval = flush_interval
+        self.fsync = fsync == "batch"
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def write(self, text: str):
+        if self._closed:
+            self.log.write(text)  # Stragglers after close() go straight to disk
+            return
+        self._queue.put(text)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every record written before this call is flushed; False on timeout."""
+        if not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            batch: List[str] = []
+            waiters: List[threading.Event] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                # A flush request or shutdown ends the batch early; so does a full batch.
+                if stop or waiters or len(batch) >= LOG_MAX_BATCH:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            self._commit(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _commit(self, batch: Sequence[str]):
+        if not batch:
+            return
+        try:
+            self.log.write("".join(batch), fsync=self.fsync)
+        except OSError as e:
+            # The writer thread must survive a full disk or a vanished directory.
+            print(f"Log write failed, {len(batch)} records dropped: {e}")
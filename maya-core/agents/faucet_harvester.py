@@ -1,28 +1,191 @@
+import asyncio
+import email.utils
 import time
 import random
 import os
+import sys
+from typing import List, Optional
+
+import aiohttp
 
 # Use absolute path for log file
 current_dir = os.path.dirname(os.path.abspath(__file__))
 LOG_FILE = os.path.join(current_dir, "..", "logs", "faucet_harvester.log")
 
+# The log module shared with the core and the containerized agent lives in the core directory
+sys.path.insert(0, os.path.dirname(current_dir))
+from agent_log import LogWriter, RotatingLog, record
+
+# --- Configuration ---
+# Comma-separated `name=url` pairs of faucets that take `POST /claim {"address": ...}` and answer
+# `{"amount_eth": ...}`. With none configured, claims are simulated against Goerli as before.
+FAUCETS = os.environ.get("MAYA_FAUCETS", "")
+WALLETS = os.environ.get("MAYA_HARVEST_WALLETS", "")                     # Comma-separated; random if empty
+WALLET_COUNT = int(os.environ.get("MAYA_HARVEST_WALLET_COUNT", 1))       # Random wallets generated when WALLETS is empty
+ROUNDS = int(os.environ.get("MAYA_HARVEST_ROUNDS", 5))                   # Claims per wallet at each faucet
+MAX_CONCURRENT_CLAIMS = int(os.environ.get("MAYA_HARVEST_CONCURRENCY", 50))
+FAUCET_RATE_PER_SEC = float(os.environ.get("MAYA_FAUCET_RATE", 5.0))     # Claims per second a faucet accepts
+FAUCET_COOLDOWN_SECS = float(os.environ.get("MAYA_FAUCET_COOLDOWN", 2.0))  # Between claims by one wallet at one faucet
+CLAIM_TIMEOUT_SECS = 10.0
+CLAIM_RATE_LIMIT_RETRIES = int(os.environ.get("MAYA_HARVEST_429_RETRIES", 3))  # Retries of a round the faucet answered 429
+
+
+def random_wallet() -> str:
+    return f"0x{''.join(random.choices('0123456789abcdef', k=40))}"
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """Seconds to wait from a Retry-After header, given as seconds or as an HTTP date."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RateLimiter:
+    """Token bucket shared by every claim against one faucet: `rate` per second, no bursts."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, secs: float):
+        """Hold every caller for `secs`, e.g. when the faucet answers 429 with Retry-After."""
+        self._paused_until = max(self._paused_until, time.monotonic() + secs)
+
+    async def acquire(self):
+        async with self._lock:  # Waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+class Faucet:
+    """One faucet: where to claim, how fast it lets us, and how long a wallet must wait."""
+
+    def __init__(self, name: str, url: Optional[str] = None, rate_per_sec: float = FAUCET_RATE_PER_SEC, cooldown_secs: float = FAUCET_COOLDOWN_SECS):
+        self.name = name
+        self.url = url  # None simulates the claim locally
+        self.cooldown_secs = cooldown_secs
+        self.limiter = RateLimiter(rate_per_sec)
+        self.claims = 0
+        self.failures = 0
+        self.rate_limited = 0  # 429 answers; the round is retried after the pause
+
+
+def parse_faucets(spec: str) -> List[Faucet]:
+    faucets = []
+    for entry in spec.split(","):
+        name, _, url = entry.strip().partition("=")
+        if name:
+            faucets.append(Faucet(name.strip(), url.strip() or None))
+    return faucets
+
+
+class Harvester:
+    """Claims from every faucet for every wallet concurrently, within each faucet's limits.
+
+    Each (wallet, faucet) pair is its own task; the faucet's token bucket paces claims across
+    all wallets, the cooldown spaces one wallet's claims, and a semaphore caps claims in flight.
+    """
+
+    def __init__(self, faucets: List[Faucet], wallets: List[str], log: LogWriter, rounds: int = ROUNDS, max_concurrent: int = MAX_CONCURRENT_CLAIMS):
+        self.faucets = faucets
+        self.wallets = wallets
+        self.log = log
+        self.rounds = rounds
+        self.max_concurrent = max_concurrent
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def claim(self, session: aiohttp.ClientSession, faucet: Faucet, wallet: str) -> Optional[float]:
+        """Amount claimed, or None if the faucet answered 429 (its limiter is then paused)."""
+        if faucet.url is None:
+            return round(random.uniform(0.0001, 0.0005), 6)
+        async with session.post(f"{faucet.url}/claim", json={"address": wallet}) as resp:
+            if resp.status == 429:
+                faucet.limiter.pause(parse_retry_after(resp.headers.get("Retry-After"), faucet.cooldown_secs))
+                return None
+            resp.raise_for_status()
+            data = await resp.json()
+        return float(data["amount_eth"])
+
+    async def _claim_round(self, session: aiohttp.ClientSession, faucet: Faucet, wallet: str) -> Optional[float]:
+        """One round's claim, retried after each 429 once the faucet's pause has passed."""
+        for _ in range(CLAIM_RATE_LIMIT_RETRIES + 1):
+            await faucet.limiter.acquire()  # Also waits out a Retry-After pause
+            async with self._semaphore:
+                try:
+                    amount = await self.claim(session, faucet, wallet)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError) as e:
+                    faucet.failures += 1
+                    self.log.write(record("error", f"Claim at {faucet.name} faucet failed for {wallet}: {e!r}", wallet=wallet))
+                    return None
+            if amount is not None:
+                return amount
+            faucet.rate_limited += 1
+        faucet.failures += 1
+        self.log.write(record("error", f"Claim at {faucet.name} faucet for {wallet} still rate limited after {CLAIM_RATE_LIMIT_RETRIES} retries", wallet=wallet))
+        return None
+
+    async def _harvest(self, session: aiohttp.ClientSession, faucet: Faucet, wallet: str) -> float:
+        total = 0.0
+        for i in range(self.rounds):
+            if i:
+                await asyncio.sleep(faucet.cooldown_secs)
+            amount = await self._claim_round(session, faucet, wallet)
+            if amount is None:
+                continue
+            faucet.claims += 1
+            total += amount
+            self.log.write(record("claimed", f"Claimed {amount} ETH from {faucet.name} faucet.", amount=amount, wallet=wallet))
+        return total
+
+    async def run(self) -> float:
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        names = ", ".join(faucet.name for faucet in self.faucets)
+        self.log.write(record("started", f"Faucet-Harvester started. Wallets: {len(self.wallets)}, faucets: {names}"))
+        connector = aiohttp.TCPConnector(limit=self.max_concurrent)
+        timeout = aiohttp.ClientTimeout(total=CLAIM_TIMEOUT_SECS)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            totals = await asyncio.gather(*(
+                self._harvest(session, faucet, wallet) for wallet in self.wallets for faucet in self.faucets
+            ))
+        total = round(sum(totals), 6)
+        self.log.write(record("session_complete", f"Session complete. Total claimed: {total} ETH.", amount=total))
+        return total
+
+
 def start():
     # Ensure the logs directory exists
     log_dir = os.path.dirname(LOG_FILE)
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
-    
-    # Create the log file if it doesn't exist
-    if not os.path.exists(LOG_FILE):
-        open(LOG_FILE, "w").close()
-    
-    with open(LOG_FILE, "a") as f:
-        f.write(f"[{time.ctime()}] Faucet-Harvester started. Wallet: 0x{''.join(random.choices('0123456789abcdef', k=40))}\n")
-        for i in range(5):
-            time.sleep(2)
-            reward = round(random.uniform(0.0001, 0.0005), 6)
-            f.write(f"[{time.ctime()}] Claimed {reward} ETH from Goerli faucet.\n")
-        f.write(f"[{time.ctime()}] Session complete. Total claimed: {round(random.uniform(0.0005, 0.001), 6)} ETH.\n")
+
+    faucets = parse_faucets(FAUCETS) or [Faucet("Goerli")]
+    wallets = [w.strip() for w in WALLETS.split(",") if w.strip()] or [random_wallet() for _ in range(WALLET_COUNT)]
+    log = LogWriter(RotatingLog(LOG_FILE))
+    try:
+        asyncio.run(Harvester(faucets, wallets, log).run())
+    finally:
+        log.close()
 
 if __name__ == "__main__":
-    start()
\ No newline at end of file
+    start()
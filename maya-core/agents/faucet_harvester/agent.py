@@ -1,20 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 import uvicorn
 import time
 import random
 import os
 import threading
+from typing import Optional
+from agent_log import LogWriter, RotatingLog, record
 
 app = FastAPI()
 
 LOG_FILE = "log.txt"
+LOG_TAIL_MAX = 10000  # Upper bound for `/log?n=`
 START_TIME = time.time()
 RUNNING = True
 TREASURY_ADDRESS = "0xdeadbeef"
 
-# Write initial log
-with open(LOG_FILE, "w") as f:
-    f.write(f"[{time.ctime()}] Agent started. PID: {os.getpid()}\n")
+# Each run starts a fresh log file; the previous run's log is archived, not truncated
+log_file = RotatingLog(LOG_FILE)
+log_file.rotate()
+log = LogWriter(log_file)  # Buffered; read through log_file, which sees flushed records
+log.write(record("started", f"Agent started. PID: {os.getpid()}"))
 
 @app.get("/probe")
 def probe():
@@ -31,21 +36,38 @@ def probe():
     }
 
 @app.get("/log")
-def get_log():
-    if not os.path.exists(LOG_FILE):
-        return {"logs": []}
-    with open(LOG_FILE, "r") as f:
-        lines = f.readlines()[-50:]
-    return {"logs": [line.strip() for line in lines]}
+def get_log(
+    since: Optional[int] = None,
+    n: int = Query(50, ge=1, le=LOG_TAIL_MAX),
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+):
+    """Without `since`: the last `n` lines. With `since` (a byte offset from a previous
+    `cursor`): only the complete lines appended after it, across rotated segments.
+    Both return the new `cursor`. With `start` (and optionally `end`), epoch ms: the lines
+    stamped in that range, up to LOG_TAIL_MAX, with `more` set if there were further ones."""
+    if start is not None:
+        lines, more = log_file.read_range(start, end, limit=LOG_TAIL_MAX)
+        return {"logs": lines, "more": more}
+    if since is None:
+        lines, cursor = log_file.tail(n)
+        return {"logs": lines, "cursor": cursor, "more": False}
+    lines, cursor, more = log_file.read_since(since)
+    return {"logs": lines, "cursor": cursor, "more": more}
 
 @app.post("/kill")
 def kill():
     global RUNNING
     RUNNING = False
-    with open(LOG_FILE, "a") as f:
-        f.write(f"[{time.ctime()}] Received kill signal. Shutting down gracefully.\n")
+    log.write(record("kill", "Received kill signal. Shutting down gracefully."))
+    log.flush()
+
+    def shutdown():
+        log.close()  # os._exit skips atexit, so drain the buffer explicitly
+        os._exit(0)
+
     # Schedule shutdown in 5s
-    threading.Timer(5.0, lambda: os._exit(0)).start()
+    threading.Timer(5.0, shutdown).start()
     return {"status": "shutting down in 5s"}
 
 # Background heartbeat writer
@@ -53,11 +75,13 @@ def heartbeat():
     while RUNNING:
         time.sleep(10)  # 🔥 For demo. Change to 600 later.
         profit = round(random.uniform(0.0001, 0.0005), 6)
-        with open(LOG_FILE, "a") as f:
-            f.write(f"[{time.ctime()}] 📈 PROFIT: {profit} ETH sent to treasury {TREASURY_ADDRESS}\n")
-            f.write(f"[{time.ctime()}] HEARTBEAT: Still alive. Wallet: 0x{''.join(random.choices('0123456789abcdef', k=40))}\n")
+        wallet = f"0x{''.join(random.choices('0123456789abcdef', k=40))}"
+        log.write(
+            record("profit", f"📈 PROFIT: {profit} ETH sent to treasury {TREASURY_ADDRESS}", amount=profit, wallet=TREASURY_ADDRESS)
+            + record("heartbeat", f"HEARTBEAT: Still alive. Wallet: {wallet}", wallet=wallet)
+        )
 
 threading.Thread(target=heartbeat, daemon=True).start()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("AGENT_PORT", 8080)))
\ No newline at end of file
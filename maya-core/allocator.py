@@ -0,0 +1,79 @@
+import math
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+# --- Configuration ---
+ALLOCATOR_RESOLUTION_ETH = 1e-6     # Cost grid for the exact solver; costs are rounded up onto it
+ALLOCATOR_MAX_CELLS = 20_000        # Budget cells at most; a larger budget coarsens the grid instead
+ALLOCATOR_EXACT_MAX_ITEMS = 500     # Above this many candidates the greedy approximation is used
+
+
+def _exact(costs: np.ndarray, values: np.ndarray, budget: float) -> List[int]:
+    """0/1 knapsack by dynamic programming over a cost grid of at most ALLOCATOR_MAX_CELLS.
+
+    Costs are rounded up, so the chosen set always fits the real budget; it is optimal for
+    the rounded costs, which on the default grid means exact for wei-scale amounts.
+    """
+    resolution = max(ALLOCATOR_RESOLUTION_ETH, budget / ALLOCATOR_MAX_CELLS)
+    cells = int(math.floor(budget / resolution + 1e-9))
+    weights = np.maximum(1, np.ceil(costs / resolution - 1e-9).astype(np.int64))
+    best = np.zeros(cells + 1)  # best[c]: most revenue with c cells of budget
+    keep = np.zeros((len(costs), cells + 1), dtype=bool)
+    for i, (w, v) in enumerate(zip(weights, values)):
+        if w > cells:
+            continue
+        candidate = best[:cells + 1 - w] + v
+        take = candidate > best[w:]
+        keep[i, w:] = take
+        best[w:] = np.where(take, candidate, best[w:])
+    chosen, c = [], cells
+    for i in range(len(costs) - 1, -1, -1):
+        if keep[i, c]:
+            chosen.append(i)
+            c -= weights[i]
+    return chosen[::-1]
+
+
+def _greedy(costs: np.ndarray, values: np.ndarray, budget: float) -> List[int]:
+    """Best revenue per ETH first, skipping whatever no longer fits; or the single most
+    valuable proposal if that alone beats the packing (which keeps it within 2x of optimal)."""
+    order = np.argsort(-(values / costs), kind="stable")
+    chosen, spent = [], 0.0
+    for i in order.tolist():
+        if spent + costs[i] <= budget:
+            chosen.append(i)
+            spent += costs[i]
+    best_single = int(np.argmax(values))
+    if values[best_single] > values[chosen].sum():
+        return [best_single]
+    return sorted(chosen)
+
+
+def plan(proposals: Sequence[Dict[str, Any]], budget_eth: float) -> Dict[str, Any]:
+    """The proposals to fund within `budget_eth` for the most expected monthly revenue.
+
+    Free proposals are always in; costly ones that earn nothing or cannot fit are never in.
+    """
+    budget_eth = max(0.0, budget_eth)
+    free = [p for p in proposals if p["cost_eth"] <= 0]
+    candidates = [p for p in proposals if 0 < p["cost_eth"] <= budget_eth and p["expected_monthly_revenue_eth"] > 0]
+    costs = np.array([p["cost_eth"] for p in candidates], dtype=float)
+    values = np.array([p["expected_monthly_revenue_eth"] for p in candidates], dtype=float)
+    if not candidates:
+        method, chosen = "exact", []
+    elif len(candidates) <= ALLOCATOR_EXACT_MAX_ITEMS:
+        # On a coarsened grid rounding can cost the DP a little; greedy is cheap enough to check.
+        method, chosen = max(("exact", _exact(costs, values, budget_eth)), ("greedy", _greedy(costs, values, budget_eth)),
+                             key=lambda option: values[option[1]].sum())
+    else:
+        method, chosen = "greedy", _greedy(costs, values, budget_eth)
+    selected = free + [candidates[i] for i in chosen]
+    return {
+        "method": method,
+        "selected": selected,
+        "total_cost_eth": float(costs[chosen].sum()) if chosen else 0.0,
+        "total_monthly_revenue_eth": sum(p["expected_monthly_revenue_eth"] for p in selected),
+        "considered": len(proposals),
+        "deferred": len(proposals) - len(selected),
+    }
@@ -0,0 +1,61 @@
+"""Requests/sec for fetching agent logs: the old `curl` subprocess vs the pooled AgentClient.
+
+Run from maya-core:  python benchmarks/bench_agent_logs.py [--requests N] [--concurrency C]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_client import AgentClient  # noqa: E402
+from stubs import start_stub_agent  # noqa: E402
+
+
+def bench_subprocess(url, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        result = subprocess.run(f"curl -s {url}/log", shell=True, capture_output=True, text=True)
+        json.loads(result.stdout)
+    return requests / (time.perf_counter() - start)
+
+
+async def bench_client(url, requests, concurrency):
+    client = AgentClient()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await client.get_logs(url)
+
+    await client.get_logs(url)  # open the pool before timing
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    url, server = start_stub_agent()
+    before = bench_subprocess(url, args.requests)
+    after_serial = asyncio.run(bench_client(url, args.requests, 1))
+    after = asyncio.run(bench_client(url, args.requests, args.concurrency))
+    server.shutdown()
+
+    print(f"subprocess curl          : {before:8.1f} req/s")
+    print(f"AgentClient (serial)     : {after_serial:8.1f} req/s")
+    print(f"AgentClient (c={args.concurrency:<3})      : {after:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Capital allocation latency and quality as the pending proposal set grows.
+
+Checks the exact solver against brute force on small sets, then times `plan` from a hundred
+to tens of thousands of proposals (exact up to ALLOCATOR_EXACT_MAX_ITEMS, greedy beyond) and
+reports how much revenue greedy gives up where both can run.
+
+Run from maya-core:  python benchmarks/bench_allocator.py [--budget 2.0]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from allocator import ALLOCATOR_EXACT_MAX_ITEMS, _exact, _greedy, plan  # noqa: E402
+
+
+def fake_proposals(n):
+    return [
+        {"id": f"prop_{i:06d}", "agent_id": f"A-{i % 300:03d}",
+         "cost_eth": round(random.choice([0.0, random.uniform(0.001, 0.5)]) if i % 20 == 0 else random.uniform(0.001, 0.5), 6),
+         "expected_monthly_revenue_eth": round(random.uniform(0, 1.0), 6)}
+        for i in range(n)
+    ]
+
+
+def brute_force(costs, values, budget):
+    best = 0.0
+    for mask in itertools.product((0, 1), repeat=len(costs)):
+        chosen = np.array(mask, dtype=bool)
+        if costs[chosen].sum() <= budget:
+            best = max(best, values[chosen].sum())
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=2.0)
+    args = parser.parse_args()
+
+    for _ in range(50):
+        costs = np.round(np.random.uniform(0.001, 0.5, 12), 6)
+        values = np.random.uniform(0, 1.0, 12)
+        exact = values[_exact(costs, values, args.budget / 2)].sum()
+        assert abs(exact - brute_force(costs, values, args.budget / 2)) < 1e-9
+    print("exact solver matches brute force on 50 sets of 12")
+
+    print(f"{'proposals':>10} {'method':>7} {'selected':>9} {'cost':>8} {'revenue':>9} {'ms':>8}")
+    for n in (100, 500, 2_000, 10_000, 50_000):
+        proposals = fake_proposals(n)
+        start = time.perf_counter()
+        result = plan(proposals, args.budget)
+        ms = (time.perf_counter() - start) * 1000
+        print(f"{n:>10} {result['method']:>7} {len(result['selected']):>9} {result['total_cost_eth']:>8.4f} "
+              f"{result['total_monthly_revenue_eth']:>9.4f} {ms:>8.2f}")
+        assert result["total_cost_eth"] <= args.budget
+
+    candidates = [p for p in fake_proposals(ALLOCATOR_EXACT_MAX_ITEMS) if 0 < p["cost_eth"] <= args.budget]
+    costs = np.array([p["cost_eth"] for p in candidates])
+    values = np.array([p["expected_monthly_revenue_eth"] for p in candidates])
+    exact, greedy = values[_exact(costs, values, args.budget)].sum(), values[_greedy(costs, values, args.budget)].sum()
+    print(f"greedy reaches {greedy / exact:.2%} of the exact optimum on {len(candidates)} proposals")
+
+
+if __name__ == "__main__":
+    main()
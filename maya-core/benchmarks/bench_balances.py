@@ -0,0 +1,56 @@
+"""Balance lookups for 1, 100 and 1000 addresses: one request per address vs one JSON-RPC batch.
+
+Run from maya-core:  python benchmarks/bench_balances.py [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rpc import JsonRpcClient  # noqa: E402
+from stubs import start_stub_rpc  # noqa: E402
+
+
+def addresses(n):
+    return [f"0x{i:040x}" for i in range(n)]
+
+
+async def per_address(client, addrs):
+    for address in addrs:
+        await client.call("eth_getBalance", [address, "latest"])
+
+
+async def batched(client, addrs):
+    await client.get_balances(addrs)
+
+
+async def timed(fn, client, addrs):
+    start = time.perf_counter()
+    await fn(client, addrs)
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(url):
+    client = JsonRpcClient(url)
+    await client.call("eth_blockNumber")  # open the connection before timing
+    print(f"{'addresses':>10} {'per-address ms':>15} {'batched ms':>11}")
+    for n in (1, 100, 1000):
+        addrs = addresses(n)
+        print(f"{n:>10} {await timed(per_address, client, addrs):>15.1f} {await timed(batched, client, addrs):>11.1f}")
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated node round-trip time")
+    args = parser.parse_args()
+    url, server = start_stub_rpc(delay_secs=args.latency_ms / 1000)
+    asyncio.run(run(url))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Search latency over the fleet log index as it grows to millions of lines.
+
+Fills a LogIndex in a temp directory with heartbeat/profit/claim-style records from ten
+agents, then times term, phrase, prefix and time-range queries against it.
+
+Run from maya-core:  python benchmarks/bench_log_search.py [--lines 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_index import LogIndex  # noqa: E402
+
+AGENTS = [f"A-{i:02d}" for i in range(10)]
+BATCH = 1000  # Lines per agent per ingest, roughly one poll's worth
+BASE_TS = 1_790_000_000_000
+
+
+def fake_record(ts):
+    roll = random.random()
+    if roll < 0.45:
+        amount = round(random.uniform(0.0001, 0.0005), 6)
+        return {"ts": ts, "event": "profit", "amount": amount, "wallet": "0xdeadbeef",
+                "msg": f"\U0001F4C8 PROFIT: {amount} ETH sent to treasury 0xdeadbeef"}
+    if roll < 0.9:
+        wallet = f"0x{random.getrandbits(160):040x}"
+        return {"ts": ts, "event": "heartbeat", "wallet": wallet, "msg": f"HEARTBEAT: Still alive. Wallet: {wallet}"}
+    if roll < 0.9999:
+        return {"ts": ts, "event": "claimed", "amount": 0.0003, "msg": "Claimed 0.0003 ETH from Goerli faucet."}
+    return {"ts": ts, "event": "message", "msg": "ERROR: faucet rejected request, rate limited"}
+
+
+def fill(index, lines):
+    n = 0
+    while n < lines:
+        batch = {}
+        for agent_id in AGENTS:
+            batch[agent_id] = [fake_record(BASE_TS + (n + i) * 100) for i in range(BATCH)]
+            n += BATCH
+        index.add(batch, {})
+    return n
+
+
+def best_ms(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = LogIndex(os.path.join(tmp, "logs.db"))
+        start = time.perf_counter()
+        total = fill(index, args.lines)
+        print(f"indexed {total} lines in {time.perf_counter() - start:.1f}s")
+        middle = BASE_TS + total * 50
+        queries = {
+            "common term": dict(terms="profit"),
+            "rare term": dict(terms="error"),
+            "phrase": dict(phrase="rate limited"),
+            "prefix": dict(terms="goer*"),
+            "time range": dict(start=middle, end=middle + 10_000),
+            "term + range": dict(terms="claimed", start=middle, end=middle + 1_000_000),
+            "term + oldest range": dict(terms="profit", start=BASE_TS, end=BASE_TS + 100_000),
+        }
+        print(f"{'query':>20} {'hits':>5} {'ms':>8}")
+        for name, query in queries.items():
+            hits, _ = index.search(**query)
+            print(f"{name:>20} {len(hits):>5} {best_ms(lambda: index.search(**query)):8.2f}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Latency of reading the last N log lines as the file grows: readlines()[-N:] vs the reverse tail reader.
+
+Builds heartbeat-style log files of increasing size in a temp directory (multi-GB by default,
+so make sure there is disk to spare) and times both readers against each.
+
+Run from maya-core:  python benchmarks/bench_log_tail.py [--sizes-mb 1,64,512,2048,4096] [-n 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_log import tail_lines  # noqa: E402
+
+LINE = (
+    f"[{time.ctime()}] \U0001F4C8 PROFIT: 0.000321 ETH sent to treasury 0xdeadbeef\n"
+    f"[{time.ctime()}] HEARTBEAT: Still alive. Wallet: 0x{'ab' * 20}\n"
+).encode()
+
+
+def grow(path, size_bytes):
+    block = LINE * (1024 * 1024 // len(LINE))
+    with open(path, "ab") as f:
+        while f.tell() < size_bytes:
+            f.write(block)
+
+
+def readlines_tail(path, n):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f.readlines()[-n:]]
+
+
+def best_ms(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes-mb", default="1,64,512,2048,4096")
+    parser.add_argument("-n", type=int, default=50)
+    parser.add_argument("--baseline-max-mb", type=int, default=512, help="Skip readlines() above this size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.txt")
+        print(f"{'size':>9} {'readlines ms':>13} {'tail ms':>9}")
+        for size_mb in (int(s) for s in args.sizes_mb.split(",")):
+            grow(path, size_mb * 1024 * 1024)
+            baseline = (
+                f"{best_ms(readlines_tail, path, args.n, repeat=1):13.1f}"
+                if size_mb <= args.baseline_max_mb else f"{'skipped':>13}"
+            )
+            print(f"{size_mb:>6} MB {baseline} {best_ms(tail_lines, path, args.n):9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Clearing a proposal backlog: one transition per proposal against one batched transaction.
+
+Fills a SQLiteProposalStore in a temp directory with pending proposals, then decides all of
+them once with `transition` per proposal (what one /proposals/approve call per item costs the
+store) and once with a single `transition_many` (what /proposals/batch does).
+
+Run from maya-core:  python benchmarks/bench_proposal_batch.py [--proposals 500]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proposal_store import SQLiteProposalStore  # noqa: E402
+
+
+def fill(store, n):
+    for i in range(n):
+        store.add({
+            "id": f"prop_{i:06d}", "agent_id": f"A-{i % 50:02d}", "purpose": "Benchmark proposal.",
+            "cost_eth": round(random.uniform(0, 0.5), 4), "expected_monthly_revenue_eth": round(random.uniform(0, 1), 4),
+            "status": "pending",
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--proposals", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteProposalStore(os.path.join(tmp, "maya.db"))
+        fill(store, args.proposals)
+        changes = [(f"prop_{i:06d}", random.choice(["awaiting_approval", "rejected"])) for i in range(args.proposals)]
+
+        start = time.perf_counter()
+        for proposal_id, status in changes:
+            store.transition(proposal_id, status)
+        single_ms = (time.perf_counter() - start) * 1000
+
+        changes = [(proposal_id, "pending") for proposal_id, _ in changes]
+        start = time.perf_counter()
+        rows = store.transition_many(changes)
+        batch_ms = (time.perf_counter() - start) * 1000
+        assert all(row["status"] == "pending" for row in rows)
+
+        start = time.perf_counter()
+        rows = store.transition_many(changes + [("prop_missing", "rejected")])
+        rollback_ms = (time.perf_counter() - start) * 1000
+        assert rows[-1] is None
+
+        print(f"{args.proposals} decisions")
+        print(f"{'one per proposal':>22} {single_ms:9.2f} ms")
+        print(f"{'one batch':>22} {batch_ms:9.2f} ms  ({single_ms / batch_ms:.0f}x)")
+        print(f"{'batch, rolled back':>22} {rollback_ms:9.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Wallet session lookup, connect and eviction cost as live sessions grow to 100k.
+
+For each size, fills a SessionStore (in memory, then SQLite-backed in a temp directory),
+times random lookups and new connects at that size, then times reloading the SQLite store
+as a restart would and evicting every session once its TTL has passed.
+
+Run from maya-core:  python benchmarks/bench_sessions.py [--sessions 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sessions import SessionStore  # noqa: E402
+
+ADDRESS = "0x16B3d93d02FB58f7aCe79157E74Eb275D2c3F734"
+LOOKUPS = 100_000
+
+
+def per_op_us(fn, ops):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def measure(store, size, ids):
+    while len(ids) < size:
+        ids.append(store.create(ADDRESS, "1").session_id)
+    sample = random.choices(ids, k=LOOKUPS)
+    lookup = per_op_us(lambda: [store.get(sid) for sid in sample], LOOKUPS)
+    connect = per_op_us(lambda: [ids.append(store.create(ADDRESS, "1").session_id) for _ in range(1000)], 1000)
+    return lookup, connect
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100_000)
+    args = parser.parse_args()
+    sizes = [s for s in (1_000, 10_000, 100_000, 1_000_000) if s <= args.sessions]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sessions.db")
+        memory, persistent = SessionStore(), SessionStore(path=path)
+        memory_ids, persistent_ids = [], []
+        print(f"{'live':>9} {'lookup us':>10} {'connect us':>11} {'lookup us':>10} {'connect us':>11}")
+        print(f"{'':>9} {'(memory)':>10} {'(memory)':>11} {'(sqlite)':>10} {'(sqlite)':>11}")
+        for size in sizes:
+            m_lookup, m_connect = measure(memory, size, memory_ids)
+            p_lookup, p_connect = measure(persistent, size, persistent_ids)
+            print(f"{size:>9} {m_lookup:>10.2f} {m_connect:>11.2f} {p_lookup:>10.2f} {p_connect:>11.2f}")
+        persistent.close()
+
+        start = time.perf_counter()
+        reloaded = SessionStore(path=path)
+        print(f"reloaded {len(reloaded)} sessions in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        for name, store in (("memory", memory), ("sqlite", reloaded)):
+            start = time.perf_counter()
+            evicted = store.evict_expired(now=time.time() + store.ttl + 1)
+            print(f"evicted {evicted} expired sessions ({name}) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        reloaded.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Load test: bursts of identical requests reach the node and the agents only once.
+
+Starts a slow JSON-RPC stub and a few slow agent stubs, runs MAYA Core against them under
+uvicorn, then fires bursts of concurrent /treasury, /wallet/balance (one address) and
+/agents/logs requests. For each burst it prints how many requests the stubs actually
+served, and finally the core's /stats/coalescing counters.
+
+Run from maya-core:  python benchmarks/load_coalescing.py [--burst 200] [--delay 0.5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_slow_rpc import CORE_DIR, free_port, wait_until_up  # noqa: E402
+from stubs import start_stub_agent, start_stub_rpc  # noqa: E402
+
+AGENTS = 3
+ADDRESS = "0x16B3d93d02FB58f7aCe79157E74Eb275D2c3F734"
+
+
+async def burst(session, url, n):
+    async def one():
+        async with session.get(url) as response:
+            await response.read()
+            return response.status
+
+    start = time.perf_counter()
+    statuses = await asyncio.gather(*(one() for _ in range(n)))
+    return statuses, (time.perf_counter() - start) * 1000
+
+
+async def run(base, servers, n):
+    rpc_server, agent_servers = servers
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        await wait_until_up(session, base)
+        await asyncio.sleep(1.0)  # Let warm-up and the first treasury refresh settle
+        print(f"{'endpoint':>16} {'requests':>9} {'rpc calls':>10} {'agent calls':>12} {'ms':>8}")
+        for path in ("/treasury", f"/wallet/balance?address={ADDRESS}", "/agents/logs"):
+            rpc_before = rpc_server.stats["requests"]
+            agents_before = sum(s.stats["requests"] for s in agent_servers)
+            statuses, ms = await burst(session, base + path, n)
+            assert all(status == 200 for status in statuses), statuses
+            print(f"{path.split('?')[0]:>16} {n:>9} {rpc_server.stats['requests'] - rpc_before:>10} "
+                  f"{sum(s.stats['requests'] for s in agent_servers) - agents_before:>12} {ms:>8.0f}")
+        async with session.get(base + "/stats/coalescing") as response:
+            print(json.dumps(await response.json(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--burst", type=int, default=200, help="Concurrent identical requests per endpoint")
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds each stub takes per request")
+    args = parser.parse_args()
+
+    rpc_url, rpc_server = start_stub_rpc(delay_secs=args.delay)
+    agents = [start_stub_agent(delay_secs=args.delay) for _ in range(AGENTS)]
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            MAYA_RPC_URL=rpc_url,
+            MAYA_AGENTS=",".join(f"S-{i}={url}" for i, (url, _) in enumerate(agents)),
+            MAYA_TREASURY_MAX_AGE_SECS="0",  # Every /treasury goes upstream: the worst case for the node
+            MAYA_DB_PATH=os.path.join(tmp, "maya.db"),
+            MAYA_LOG_INDEX_PATH=os.path.join(tmp, "logs.db"),
+            MAYA_SESSION_DB_PATH="",
+        )
+        core = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=CORE_DIR, env=env,
+        )
+        try:
+            asyncio.run(run(f"http://127.0.0.1:{port}", (rpc_server, [server for _, server in agents]), args.burst))
+        finally:
+            core.terminate()
+            core.wait()
+            rpc_server.shutdown()
+            for _, server in agents:
+                server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Load test: one harvester process driving hundreds of wallets across several faucets.
+
+Starts local faucet stubs that answer 429 to anything over their rate limit or inside a
+wallet's cooldown, runs the asyncio Harvester against them, and reports throughput, how
+many claims the stubs turned away (none when the harvester knows each faucet's rate) and
+peak claims in flight. With --assumed-rate above --rate the harvester overruns the stubs,
+and every round must still land through the 429 Retry-After retries.
+
+Run from maya-core:  python benchmarks/load_faucet_harvester.py [--wallets 300] [--faucets 2]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+CORE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CORE_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(CORE_DIR, "agents"))
+
+from stubs import start_stub_faucet  # noqa: E402
+from faucet_harvester import Faucet, Harvester, random_wallet  # noqa: E402
+from agent_log import LogWriter, RotatingLog  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wallets", type=int, default=300)
+    parser.add_argument("--faucets", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--rate", type=float, default=200.0, help="Claims per second each faucet allows")
+    parser.add_argument("--assumed-rate", type=float, help="Rate the harvester is configured with (default: --rate)")
+    parser.add_argument("--http-date", action="store_true", help="Stubs send Retry-After as an HTTP date")
+    parser.add_argument("--cooldown", type=float, default=0.5)
+    parser.add_argument("--faucet-delay", type=float, default=0.05, help="Stub response time per claim")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    stubs, faucets = [], []
+    for i in range(args.faucets):
+        url, server = start_stub_faucet(args.rate, args.cooldown, args.faucet_delay, retry_after_date=args.http_date)
+        stubs.append(server)
+        faucets.append(Faucet(f"stub-{i}", url, rate_per_sec=args.assumed_rate or args.rate, cooldown_secs=args.cooldown))
+    wallets = [random_wallet() for _ in range(args.wallets)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = LogWriter(RotatingLog(os.path.join(tmp, "harvest.log")))
+        harvester = Harvester(faucets, wallets, log, rounds=args.rounds, max_concurrent=args.concurrency)
+        start = time.perf_counter()
+        total = asyncio.run(harvester.run())
+        elapsed = time.perf_counter() - start
+        log.close()
+
+    claims = sum(f.claims for f in faucets)
+    expected = args.wallets * args.faucets * args.rounds
+    floor = expected / (args.rate * args.faucets)
+    print(f"{claims}/{expected} claims, {total} ETH in {elapsed:.1f}s ({claims / elapsed:.0f} claims/s)")
+    print(f"rate-limit floor {floor:.1f}s; sequential with one wallet per process would take "
+          f"{expected * (args.faucet_delay + args.cooldown):.0f}s")
+    for faucet, server in zip(faucets, stubs):
+        s = server.stats
+        print(f"{faucet.name}: accepted {s['claims']}, rate-limited {s['rate_limited']}, "
+              f"cooldown {s['cooldown']}, peak in flight {s['max_in_flight']}; "
+              f"harvester retried {faucet.rate_limited}, gave up {faucet.failures}")
+    if claims != expected:
+        sys.exit(f"FAIL: {expected - claims} of {expected} claims never landed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Load test: proposal endpoints stay fast while every chain call is artificially slow.
+
+Starts a JSON-RPC stub with a large per-request delay, runs MAYA Core against it under
+uvicorn, floods /wallet/balance and /treasury with concurrent requests, and measures
+/proposals/pending latency while those are in flight.
+
+Run from maya-core:  python benchmarks/load_slow_rpc.py [--rpc-delay 2.0] [--chain-requests 200]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stubs import start_stub_rpc  # noqa: E402
+
+CORE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_until_up(session, base):
+    for _ in range(100):
+        try:
+            async with session.get(base + "/proposals/pending"):
+                return
+        except aiohttp.ClientError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("MAYA Core did not start")
+
+
+async def sample_latency(session, base, samples):
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        async with session.get(base + "/proposals/pending") as response:
+            await response.read()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summary(latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return f"p50 {statistics.median(latencies):7.1f} ms   p95 {p95:7.1f} ms   max {latencies[-1]:7.1f} ms"
+
+
+async def run(base, chain_requests, samples):
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await wait_until_up(session, base)
+        idle = await sample_latency(session, base, samples)
+
+        async def chain_call(i):
+            path = "/treasury" if i % 2 else f"/wallet/balance?address=0x{i:040x}"
+            async with session.get(base + path) as response:
+                await response.read()
+
+        flood = [asyncio.ensure_future(chain_call(i)) for i in range(chain_requests)]
+        await asyncio.sleep(0.2)  # let the flood occupy the server
+        loaded = await sample_latency(session, base, samples)
+        await asyncio.gather(*flood)
+
+    print(f"/proposals/pending idle              : {summary(idle)}")
+    print(f"/proposals/pending with {chain_requests:4} slow RPC : {summary(loaded)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rpc-delay", type=float, default=2.0, help="Seconds the stub node takes per request")
+    parser.add_argument("--chain-requests", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args()
+
+    rpc_url, rpc_server = start_stub_rpc(delay_secs=args.rpc_delay)
+    port = free_port()
+    env = dict(os.environ, MAYA_RPC_URL=rpc_url, MAYA_TREASURY_MAX_AGE_SECS="0")
+    core = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=CORE_DIR, env=env,
+    )
+    try:
+        asyncio.run(run(f"http://127.0.0.1:{port}", args.chain_requests, args.samples))
+    finally:
+        core.terminate()
+        core.wait()
+        rpc_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
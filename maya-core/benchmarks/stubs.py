@@ -0,0 +1,150 @@
+"""Tiny in-process HTTP stubs used by the benchmarks in this directory."""
+import email.utils
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def start_stub_agent(lines=50, delay_secs=0.0):
+    """Serve a fake agent `/log` on a free localhost port; returns (base_url, server).
+
+    Requests served are counted in `server.stats`.
+    """
+    body = json.dumps({"logs": [f"[{time.ctime()}] HEARTBEAT: line {i}" for i in range(lines)]}).encode()
+    stats = {"requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like uvicorn
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            with lock:
+                stats["requests"] += 1
+            if delay_secs:
+                time.sleep(delay_secs)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.stats = stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+def start_stub_rpc(delay_secs=0.0):
+    """Serve a fake Ethereum JSON-RPC node (single and batch requests); returns (url, server).
+
+    `delay_secs` is charged once per HTTP request, like a network round trip to a remote node.
+    Requests served are counted in `server.stats`.
+    """
+    stats = {"requests": 0}
+    lock = threading.Lock()
+
+    def answer(call):
+        if call.get("method") == "eth_blockNumber":
+            result = "0x10d4f"
+        else:
+            result = "0xde0b6b3a7640000"  # 1 ETH
+        return {"jsonrpc": "2.0", "id": call.get("id"), "result": result}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                stats["requests"] += 1
+            if delay_secs:
+                time.sleep(delay_secs)
+            reply = [answer(call) for call in payload] if isinstance(payload, list) else answer(payload)
+            body = json.dumps(reply).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.stats = stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+def start_stub_faucet(rate_per_sec=10.0, cooldown_secs=0.0, delay_secs=0.0, retry_after_date=False):
+    """Serve a fake faucet `POST /claim` that enforces its limits; returns (base_url, server).
+
+    Claims beyond `rate_per_sec` (a token bucket allowing one second of burst) or repeated by
+    a wallet within `cooldown_secs` get 429 with a one-second Retry-After, sent as an HTTP
+    date with `retry_after_date`. Counters are kept in `server.stats`.
+    """
+    lock = threading.Lock()
+    stats = {"claims": 0, "rate_limited": 0, "cooldown": 0, "in_flight": 0, "max_in_flight": 0}
+    bucket = {"tokens": rate_per_sec, "updated": time.monotonic()}
+    last_claim = {}
+
+    def admit(wallet):
+        with lock:
+            now = time.monotonic()
+            bucket["tokens"] = min(rate_per_sec, bucket["tokens"] + (now - bucket["updated"]) * rate_per_sec)
+            bucket["updated"] = now
+            if bucket["tokens"] < 1:
+                stats["rate_limited"] += 1
+                return False
+            if now - last_claim.get(wallet, float("-inf")) < cooldown_secs:
+                stats["cooldown"] += 1
+                return False
+            bucket["tokens"] -= 1
+            last_claim[wallet] = now
+            stats["claims"] += 1
+            return True
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            wallet = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["address"]
+            with lock:
+                stats["in_flight"] += 1
+                stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            try:
+                if delay_secs:
+                    time.sleep(delay_secs)
+                if admit(wallet):
+                    status, reply = 200, {"amount_eth": 0.0003}
+                else:
+                    status, reply = 429, {"error": "slow down"}
+            finally:
+                with lock:
+                    stats["in_flight"] -= 1
+            body = json.dumps(reply).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if status == 429:
+                self.send_header("Retry-After", email.utils.formatdate(time.time() + 1, usegmt=True) if retry_after_date else "1")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.stats = stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
@@ -0,0 +1,49 @@
+import hashlib
+import secrets
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Mixed into every tag so counters that restart at zero with the process never
+# collide with validators a client cached from a previous run.
+BOOT_ID = secrets.token_hex(4)
+
+
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    """ETag from small version parts (counters, fingerprints, query args), never from the body."""
+    digest = hashlib.blake2b(repr((BOOT_ID,) + parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match, as RFC 7232 prescribes for GET."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def conditional_response(
+    request: Request,
+    etag: str,
+    build: Callable[[], Any],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """304 if the client already holds `etag`; otherwise call `build` and send the JSON with the tag."""
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return JSONResponse(content=jsonable_encoder(build()), headers=dict(headers or {}, ETag=etag))
@@ -0,0 +1,166 @@
+import asyncio
+import heapq
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent_client import AgentClient, AgentUnreachable
+from log_records import format_line, parse_line
+
+# --- Configuration ---
+# Comma-separated `agent_id=url` pairs, e.g. "A-01=http://localhost:8080,A-02=http://localhost:8081"
+DEFAULT_AGENTS = "A-01=http://localhost:8080"
+# Same format for agent payout wallets: "A-01=0xabc...,A-02=0xdef..."
+DEFAULT_AGENT_WALLETS = ""
+FLEET_MAX_IN_FLIGHT = 32      # Bound on concurrent agent requests during a fan-out
+FLEET_DEADLINE_SECS = 5.0     # Whole fan-out budget; stragglers are reported as timed out
+FLEET_LOG_LIMIT = 200         # Lines kept from the merged stream
+
+
+def parse_agents(spec: str) -> Dict[str, str]:
+    agents: Dict[str, str] = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        agent_id, _, url = entry.partition("=")
+        agents[agent_id.strip()] = url.strip()
+    return agents
+
+
+def _stamp(agent_id: str, lines: List[str], order: int) -> List[Tuple[int, int, str]]:
+    # Unstamped lines inherit the previous stamp so they stay next to the line they follow.
+    stamped = []
+    last = 0
+    for line in lines:
+        record = parse_line(line)
+        ts = record["ts"]
+        if ts is not None and ts >= last:
+            last = ts
+        stamped.append((last, order, f"[{agent_id}] {format_line(record)}"))
+    return stamped
+
+
+def merge_logs(lines_by_agent: Dict[str, List[str]]) -> List[str]:
+    """Merge per-agent line lists (each already in order) by timestamp, prefixing the agent id.
+
+    JSONL records and legacy text lines both come out as `[agent_id] [ctime] message`."""
+    streams = [_stamp(agent_id, lines, order) for order, (agent_id, lines) in enumerate(lines_by_agent.items())]
+    return [line for _, _, line in heapq.merge(*streams)]
+
+
+class Fleet:
+    """The registry of every agent the Chancellor oversees, and the fan-out across them."""
+
+    def __init__(
+        self,
+        client: AgentClient,
+        agents: Optional[Dict[str, str]] = None,
+        max_in_flight: int = FLEET_MAX_IN_FLIGHT,
+        deadline: float = FLEET_DEADLINE_SECS,
+    ):
+        self.client = client
+        self.agents: Dict[str, str] = dict(agents) if agents is not None else parse_agents(
+            os.environ.get("MAYA_AGENTS", DEFAULT_AGENTS)
+        )
+        self.wallets: Dict[str, str] = parse_agents(os.environ.get("MAYA_AGENT_WALLETS", DEFAULT_AGENT_WALLETS))
+        self.max_in_flight = max_in_flight
+        self.deadline = deadline
+        self.warm = False
+        self._statuses: Dict[str, str] = {}  # Latest reachability per agent, from any fetch or probe
+
+    def register(self, agent_id: str, url: str):
+        self.agents[agent_id] = url
+
+    def unregister(self, agent_id: str):
+        self.agents.pop(agent_id, None)
+        self._statuses.pop(agent_id, None)
+
+    def record_status(self, agent_id: str, status: str):
+        """Note how the last request to `agent_id` went ("ok", "unreachable", ...) for readiness."""
+        if agent_id in self.agents:
+            self._statuses[agent_id] = status
+
+    async def warm_up(self):
+        """Reach every agent once so pooled connections are open before traffic arrives."""
+        await self.gather_logs(limit=1)
+        self.warm = True
+
+    def readiness(self) -> Dict[str, Any]:
+        if not self.warm:
+            return {"status": "warming", "total": len(self.agents)}
+        # Agents registered since the last fetch have not answered yet, so they do not count.
+        reachable = sum(1 for agent_id in self.agents if self._statuses.get(agent_id) == "ok")
+        return {
+            "status": "ready" if reachable or not self.agents else "unavailable",
+            "reachable": reachable,
+            "total": len(self.agents),
+        }
+
+    async def _fetch_logs(self, semaphore: asyncio.Semaphore, agent_id: str, url: str, since: Optional[int]) -> Tuple[str, Dict[str, Any], List[str]]:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                data = await self.client.get_logs(url, since=since)
+            except AgentUnreachable:
+                return agent_id, {"status": "unreachable"}, []
+            except ValueError:
+                return agent_id, {"status": "bad_response"}, []
+            latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        if not isinstance(data, dict):
+            return agent_id, {"status": "bad_response"}, []
+        lines = data.get("logs") or []
+        status = {"status": "ok", "lines": len(lines), "latency_ms": latency_ms}
+        if "cursor" in data:  # Agents that support incremental `/log?since=`
+            status["cursor"] = data["cursor"]
+            status["more"] = bool(data.get("more"))
+        return agent_id, status, lines
+
+    async def fetch_logs(self, cursors: Optional[Dict[str, int]] = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+        """Query every agent's `/log` concurrently; returns (status per agent, lines per agent).
+
+        Agents with an entry in `cursors` are asked only for lines after it; their new
+        cursor comes back in the status. Latency is bounded by the slowest agent (or the
+        fleet deadline), not by the sum.
+        """
+        cursors = cursors or {}
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        tasks = {
+            asyncio.ensure_future(self._fetch_logs(semaphore, agent_id, url, cursors.get(agent_id))): agent_id
+            for agent_id, url in self.agents.items()
+        }
+        statuses: Dict[str, Dict[str, Any]] = {}
+        lines_by_agent: Dict[str, List[str]] = {}
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+            for task in pending:
+                task.cancel()
+                statuses[tasks[task]] = {"status": "timeout"}
+            for task in done:
+                agent_id, status, lines = task.result()
+                statuses[agent_id] = status
+                lines_by_agent[agent_id] = lines
+        for agent_id, status in statuses.items():
+            self.record_status(agent_id, status["status"])
+        return dict(sorted(statuses.items())), lines_by_agent
+
+    async def gather_logs(self, limit: int = FLEET_LOG_LIMIT) -> Tuple[Dict[str, Any], Tuple]:
+        """Every agent's recent lines merged into one timestamp-ordered stream, plus per-agent
+        status; returned with the fingerprint of what each agent sent (see `fingerprint`)."""
+        statuses, lines_by_agent = await self.fetch_logs()
+        merged = merge_logs(lines_by_agent)
+        result = {"logs": merged[-limit:] if limit else merged, "agents": statuses}
+        return result, self.fingerprint(statuses, lines_by_agent)
+
+    @staticmethod
+    def fingerprint(statuses: Dict[str, Dict[str, Any]], lines_by_agent: Dict[str, List[str]]) -> Tuple:
+        """Cheap identity of one fetch: per agent, its status, cursor, line count and newest line.
+
+        Taken per agent rather than from the merged tail: once that is capped, a new line older
+        than another agent's newest changes the body but neither the tail's length nor its end.
+        """
+        return tuple(
+            (agent_id, status["status"], status.get("cursor"), len(lines_by_agent.get(agent_id, ())),
+             lines_by_agent[agent_id][-1] if lines_by_agent.get(agent_id) else None)
+            for agent_id, status in statuses.items()
+        )
@@ -0,0 +1,273 @@
+import asyncio
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from agent_log import RotatingLog
+from fleet import Fleet
+from log_records import format_line, parse_line
+from log_stream import new_lines
+
+# --- Configuration ---
+LOG_INDEX_POLL_SECS = 5.0     # How often the indexer pulls new lines from the fleet
+LOG_SEARCH_MAX = 1000         # Most hits a single search returns
+
+
+def match_expression(terms: Optional[str] = None, phrase: Optional[str] = None) -> Optional[str]:
+    """FTS5 query for all of `terms` (a trailing `*` makes one a prefix) and the exact `phrase`.
+
+    Every token is quoted, so user input never reaches the FTS5 query grammar."""
+    parts = []
+    for term in (terms or "").split():
+        prefix = term.endswith("*") and len(term) > 1
+        quoted = '"' + term.rstrip("*").replace('"', '""') + '"'
+        parts.append(quoted + "*" if prefix else quoted)
+    if phrase and phrase.strip():
+        parts.append('"' + phrase.strip().replace('"', '""') + '"')
+    return " AND ".join(parts) or None
+
+
+class LogIndex:
+    """Fleet log lines in SQLite with an FTS5 inverted index over message and event.
+
+    Also remembers each agent's `/log?since=` cursor, so ingestion resumes where it
+    stopped across restarts instead of re-reading agent logs.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS log_lines (
+                    id INTEGER PRIMARY KEY,
+                    agent_id TEXT NOT NULL,
+                    ts INTEGER,
+                    event TEXT NOT NULL,
+                    amount REAL,
+                    wallet TEXT,
+                    msg TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_log_lines_ts ON log_lines (ts, id);
+                CREATE INDEX IF NOT EXISTS idx_log_lines_agent ON log_lines (agent_id, ts, id);
+                CREATE VIRTUAL TABLE IF NOT EXISTS log_lines_fts USING fts5(
+                    msg, event, content='log_lines', content_rowid='id'
+                );
+                CREATE TABLE IF NOT EXISTS log_batches (
+                    first_id INTEGER PRIMARY KEY,
+                    last_id INTEGER NOT NULL,
+                    min_ts INTEGER NOT NULL,
+                    max_ts INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_log_batches_max_ts ON log_batches (max_ts);
+                CREATE TABLE IF NOT EXISTS log_cursors (
+                    agent_id TEXT PRIMARY KEY,
+                    cursor INTEGER NOT NULL
+                );
+            """)
+
+    def close(self):
+        self._conn.close()
+
+    def cursors(self) -> Dict[str, int]:
+        with self._lock:
+            return {row["agent_id"]: row["cursor"] for row in self._conn.execute("SELECT * FROM log_cursors")}
+
+    def add(self, records_by_agent: Dict[str, List[Dict[str, Any]]], cursors: Dict[str, int]) -> int:
+        """Index parsed records and advance the agents' cursors in one transaction."""
+        rows = [
+            (agent_id, r["ts"], r["event"], r.get("amount"), r.get("wallet"), r["msg"])
+            for agent_id, records in records_by_agent.items()
+            for r in records
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                first = (self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM log_lines").fetchone()[0]) + 1
+                self._conn.executemany(
+                    "INSERT INTO log_lines (id, agent_id, ts, event, amount, wallet, msg) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(first + i,) + row for i, row in enumerate(rows)],
+                )
+                self._conn.executemany(
+                    "INSERT INTO log_lines_fts (rowid, msg, event) VALUES (?, ?, ?)",
+                    [(first + i, row[5], row[2]) for i, row in enumerate(rows)],
+                )
+                stamps = [row[1] for row in rows if row[1] is not None]
+                if stamps:
+                    self._conn.execute(
+                        "INSERT INTO log_batches (first_id, last_id, min_ts, max_ts) VALUES (?, ?, ?, ?)",
+                        (first, first + len(rows) - 1, min(stamps), max(stamps)),
+                    )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO log_cursors (agent_id, cursor) VALUES (?, ?)", list(cursors.items())
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def events(self, events: Sequence[str]) -> Iterator[Tuple[str, int, float]]:
+        """(agent_id, ts, amount) of every stamped line with one of `events`, in index order."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT agent_id, ts, amount FROM log_lines WHERE event IN ({','.join('?' * len(events))})"
+                " AND ts IS NOT NULL AND amount IS NOT NULL ORDER BY id",
+                list(events),
+            ).fetchall()
+        return (tuple(row) for row in rows)
+
+    def _id_bounds(self, start: Optional[int], end: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+        # Ids are assigned per ingest batch, not in time order, so a time range maps to the id
+        # span of every batch whose stamps overlap it. Exact, and lets SQLite seek by rowid.
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("max_ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("min_ts <= ?")
+            params.append(end)
+        row = self._conn.execute(
+            "SELECT MIN(first_id), MAX(last_id) FROM log_batches WHERE " + " AND ".join(clauses), params
+        ).fetchone()
+        return (row[0], row[1]) if row[0] is not None else (0, -1)
+
+    def search(
+        self,
+        terms: Optional[str] = None,
+        phrase: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        agent_id: Optional[str] = None,
+        event: Optional[str] = None,
+        before: Optional[int] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Matching lines, most recently indexed first, and the `before` id of the next page.
+
+        `start`/`end` are epoch ms; `terms` must all occur, `phrase` must occur verbatim."""
+        clauses, params = [], []
+        match = match_expression(terms, phrase)
+        if match:
+            # Driven from the FTS index, which yields matches in rowid order without sorting.
+            source = "log_lines_fts JOIN log_lines ON log_lines.id = log_lines_fts.rowid"
+            clauses.append("log_lines_fts MATCH ?")
+            params.append(match)
+            order = "log_lines_fts.rowid"
+        else:
+            source, order = "log_lines", "log_lines.id"
+        for condition, value in (
+            ("log_lines.ts >= ?", start),
+            ("log_lines.ts <= ?", end),
+            ("log_lines.agent_id = ?", agent_id),
+            ("log_lines.event = ?", event),
+            (f"{order} < ?", before),
+        ):
+            if value is not None:
+                clauses.append(condition)
+                params.append(value)
+        with self._lock:
+            if start is not None or end is not None:
+                clauses.append(f"{order} BETWEEN ? AND ?")
+                params.extend(self._id_bounds(start, end))
+            sql = (
+                f"SELECT log_lines.* FROM {source}"
+                + (" WHERE " + " AND ".join(clauses) if clauses else "")
+                + f" ORDER BY {order} DESC LIMIT ?"
+            )
+            try:
+                rows = self._conn.execute(sql, params + [limit + 1]).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search: {e}") from e
+        hits = [dict(row, line=f"[{row['agent_id']}] {format_line(dict(row))}") for row in rows[:limit]]
+        next_before = hits[-1]["id"] if len(rows) > limit else None
+        return hits, next_before
+
+
+RecordListener = Callable[[Dict[str, List[Dict[str, Any]]]], None]
+
+
+class LogIndexer:
+    """Pulls new lines from every agent, and from `local_logs` written on this host by
+    processes that serve no `/log` (agent id -> path), and feeds them to the LogIndex.
+
+    Listeners get each batch of parsed records per agent once it is safely indexed.
+    """
+
+    def __init__(
+        self,
+        fleet: Fleet,
+        index: LogIndex,
+        poll_interval: float = LOG_INDEX_POLL_SECS,
+        listeners: Sequence[RecordListener] = (),
+        local_logs: Optional[Dict[str, str]] = None,
+    ):
+        self.fleet = fleet
+        self.index = index
+        self.poll_interval = poll_interval
+        self.listeners = list(listeners)
+        # Read-only views; each read lists the segments afresh, so the writer's rotations show.
+        self.local_logs = {agent_id: RotatingLog(path) for agent_id, path in (local_logs or {}).items()}
+        self._cursors: Optional[Dict[str, int]] = None
+        self._windows: Dict[str, List[str]] = {}  # Last tail seen per agent without `since` support
+
+    @staticmethod
+    def _records(lines: List[str]) -> List[Dict[str, Any]]:
+        # Unstamped lines take the stamp of the line before them, as in the merged view.
+        records = []
+        last = None
+        for line in lines:
+            record = parse_line(line)
+            if record["ts"] is None:
+                record["ts"] = last
+            last = record["ts"]
+            records.append(record)
+        return records
+
+    async def poll_once(self) -> bool:
+        """Index lines added since the last poll; True if some agent has more waiting."""
+        loop = asyncio.get_event_loop()
+        if self._cursors is None:
+            self._cursors = await loop.run_in_executor(None, self.index.cursors)
+        # An agent never indexed before starts at offset 0, not at its tail: its paged
+        # `read_since` backfills the whole log, archives included, a chunk per poll.
+        since = {agent_id: self._cursors.get(agent_id, 0) for agent_id in self.fleet.agents}
+        statuses, lines_by_agent = await self.fleet.fetch_logs(since)
+        records, cursors = {}, {}
+        more = False
+        for agent_id, lines in lines_by_agent.items():
+            status = statuses[agent_id]
+            if "cursor" in status:
+                fresh = lines
+                cursors[agent_id] = status["cursor"]
+                more = more or status["more"]
+            else:
+                fresh = new_lines(self._windows.get(agent_id, []), lines)
+                self._windows[agent_id] = lines
+            records[agent_id] = self._records(fresh)
+        for agent_id, log in self.local_logs.items():
+            lines, cursor, local_more = await loop.run_in_executor(None, log.read_since, self._cursors.get(agent_id, 0))
+            if cursor != self._cursors.get(agent_id):
+                records[agent_id] = self._records(lines)
+                cursors[agent_id] = cursor
+            more = more or local_more
+        if records or cursors:
+            await loop.run_in_executor(None, self.index.add, records, cursors)
+            self._cursors.update(cursors)
+            for listener in self.listeners:
+                listener(records)
+        return more
+
+    async def run(self):
+        while True:
+            more = False
+            try:
+                more = await self.poll_once()
+            except Exception as e:
+                print(f"Log indexing failed: {e}")
+            if not more:
+                await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,82 @@
+import json
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# Agents write JSONL records (see agent_log.py):
+#   {"ts": <epoch ms>, "event": "profit", "amount": 0.000321, "wallet": "0x...", "msg": "..."}
+# Older agents wrote `[ctime] message` text; the patterns below lift the same fields out of it.
+_LEGACY_EVENTS = (
+    ("profit", re.compile(r"PROFIT:\s*(?P<amount>[\d.]+) ETH sent to treasury (?P<wallet>\S+)")),
+    ("claimed", re.compile(r"Claimed (?P<amount>[\d.]+) ETH")),
+    ("session_complete", re.compile(r"Session complete\. Total claimed: (?P<amount>[\d.]+) ETH")),
+    ("heartbeat", re.compile(r"HEARTBEAT:.*?Wallet: (?P<wallet>0x[0-9a-fA-F]+)")),
+    ("started", re.compile(r"started\.(?:.*?Wallet: (?P<wallet>0x[0-9a-fA-F]+))?")),
+    ("kill", re.compile(r"Received kill signal")),
+)
+
+
+def _epoch_ms(value: Any) -> Optional[int]:
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+def _legacy_stamp(line: str) -> Tuple[Optional[int], str]:
+    """(epoch ms, message) of a `[Mon Sep  8 17:36:37 2025] message` line; (None, line) if unstamped."""
+    if line.startswith("[") and "]" in line:
+        close = line.index("]")
+        try:
+            ts = int(time.mktime(time.strptime(line[1:close], "%a %b %d %H:%M:%S %Y")) * 1000)
+        except ValueError:
+            return None, line
+        return ts, line[close + 1:].strip()
+    return None, line
+
+
+def _legacy_record(line: str) -> Dict[str, Any]:
+    ts, message = _legacy_stamp(line)
+    record: Dict[str, Any] = {"ts": ts, "event": "message", "msg": message}
+    for event, pattern in _LEGACY_EVENTS:
+        match = pattern.search(message)
+        if match:
+            record["event"] = event
+            for field, value in match.groupdict().items():
+                if value is not None:
+                    record[field] = float(value) if field == "amount" else value
+            break
+    return record
+
+
+def parse_line(line: str) -> Dict[str, Any]:
+    """A log line as a record with `ts` (epoch ms or None), `event`, `msg` and, when known,
+    `amount` and `wallet`. Accepts JSONL records and legacy plain-text lines alike."""
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if isinstance(record, dict):
+            record.setdefault("event", "message")
+            record.setdefault("msg", "")
+            record["ts"] = _epoch_ms(record.get("ts"))
+            return record
+    return _legacy_record(line)
+
+
+def record_ts(line: str) -> Optional[int]:
+    """Just the `ts` that `parse_line` would give, without matching any event patterns."""
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if isinstance(record, dict):
+            return _epoch_ms(record.get("ts"))
+    return _legacy_stamp(line)[0]
+
+
+def format_line(record: Dict[str, Any]) -> str:
+    """The `[ctime] message` text the dashboards have always shown."""
+    ts: Optional[int] = record.get("ts")
+    if ts is None:
+        return record["msg"]
+    return f"[{time.ctime(ts / 1000)}] {record['msg']}"
@@ -0,0 +1,131 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from etag import BOOT_ID
+from fleet import Fleet, merge_logs
+
+# --- Configuration ---
+LOG_POLL_SECS = 2.0          # How often the single poller asks the fleet for new lines
+LOG_BACKLOG = 2000           # Events kept in memory for Last-Event-ID resume
+LOG_INITIAL_LINES = 50       # Backlog sent to a subscriber that has no last event id
+LOG_KEEPALIVE_SECS = 5.0     # Comment frames; must stay under OkHttp's default 10s read timeout
+
+
+def new_lines(previous: List[str], current: List[str]) -> List[str]:
+    """Lines of `current` not already seen in `previous`, for agents that return a sliding tail.
+
+    Finds the longest suffix of `previous` that is a prefix of `current`; if the windows do
+    not overlap at all, the agent produced more than a window's worth and all of `current` is new.
+    """
+    for k in range(min(len(previous), len(current)), 0, -1):
+        if previous[-k:] == current[:k]:
+            return current[k:]
+    return list(current)
+
+
+class LogHub:
+    """Polls the fleet once and fans new lines out to every stream subscriber.
+
+    Events get increasing sequence numbers and are kept in a bounded ring, so a client
+    that reconnects with its last event id resumes without re-reading any agent log.
+    """
+
+    def __init__(self, fleet: Fleet, poll_interval: float = LOG_POLL_SECS, backlog: int = LOG_BACKLOG):
+        self.fleet = fleet
+        self.poll_interval = poll_interval
+        self._events: Deque[Tuple[int, str]] = deque(maxlen=backlog)
+        self._seq = 0
+        self._cursors: Dict[str, int] = {}        # Byte offset per agent that supports `/log?since=`
+        self._windows: Dict[str, List[str]] = {}  # Last tail seen per agent that doesn't
+        self._changed = asyncio.Event()
+        self._subscribers = 0
+        self._poller: Optional[asyncio.Task] = None
+
+    def publish(self, lines: List[str]):
+        for line in lines:
+            self._seq += 1
+            self._events.append((self._seq, line))
+        if lines:
+            # Wake everyone waiting on the current event, then arm a fresh one.
+            self._changed.set()
+            self._changed = asyncio.Event()
+
+    async def poll_once(self) -> bool:
+        """Publish lines added since the last poll; True if some agent has more waiting."""
+        statuses, lines_by_agent = await self.fleet.fetch_logs(self._cursors)
+        fresh = {}
+        more = False
+        for agent_id, lines in lines_by_agent.items():
+            status = statuses[agent_id]
+            if "cursor" in status:
+                fresh[agent_id] = lines  # The agent already sent only what is new
+                self._cursors[agent_id] = status["cursor"]
+                more = more or status["more"]
+            else:
+                fresh[agent_id] = new_lines(self._windows.get(agent_id, []), lines)
+                self._windows[agent_id] = lines
+        self.publish(merge_logs(fresh))
+        return more
+
+    async def _run(self):
+        try:
+            while self._subscribers:
+                more = False
+                try:
+                    more = await self.poll_once()
+                except Exception as e:
+                    print(f"Log stream poll failed: {e}")
+                if not more:  # Agents that are behind are drained without waiting
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            self._poller = None
+
+    def _ensure_polling(self):
+        # Polling only runs while someone is listening.
+        if self._poller is None:
+            self._poller = asyncio.ensure_future(self._run())
+
+    async def close(self):
+        if self._poller is not None:
+            self._poller.cancel()
+
+    @staticmethod
+    def event_id(seq: int) -> str:
+        return f"{BOOT_ID}-{seq}"
+
+    def _resume_seq(self, last_event_id: Optional[str]) -> int:
+        """Sequence to resume after; ids from a previous process replay the whole backlog."""
+        if not last_event_id:
+            oldest = self._events[0][0] - 1 if self._events else self._seq
+            return max(oldest, self._seq - LOG_INITIAL_LINES)
+        boot, _, seq = last_event_id.rpartition("-")
+        if boot != BOOT_ID or not seq.isdigit():
+            return 0
+        return int(seq)
+
+    def _since(self, seq: int) -> List[Tuple[int, str]]:
+        if not self._events or self._events[-1][0] <= seq:
+            return []
+        start = max(0, seq - self._events[0][0] + 1)  # Sequence numbers are contiguous in the ring
+        return [self._events[i] for i in range(start, len(self._events))]
+
+    async def subscribe(self, last_event_id: Optional[str] = None, keepalive: float = LOG_KEEPALIVE_SECS) -> AsyncIterator[str]:
+        """Yield SSE frames: the backlog after `last_event_id`, then new lines as they arrive."""
+        self._subscribers += 1
+        self._ensure_polling()
+        try:
+            last = self._resume_seq(last_event_id)
+            while True:
+                changed = self._changed
+                events = self._since(last)
+                if events:
+                    last = events[-1][0]
+                    yield "".join(f"id: {self.event_id(seq)}\ndata: {line}\n\n" for seq, line in events)
+                    continue
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            self._subscribers -= 1
@@ -1,17 +1,42 @@
 
-import subprocess
-import json
+import asyncio
+import os
+import threading
 import time
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, Any, List
-from web3 import Web3 # Re-enabled Web3
-from decimal import Decimal
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional
+from agent_client import AgentClient
+from allocator import plan
+from fleet import Fleet, FLEET_LOG_LIMIT
+from log_index import LOG_SEARCH_MAX, LogIndex, LogIndexer
+from log_stream import LogHub
+from probe import ProbeScheduler
+from revenue import REVENUE_ROLLUPS, RevenueSeries
+from scoring import ScoringEngine
+from sessions import SESSION_TTL_SECS, SessionStore
+from singleflight import SingleFlight
+from supervisor import Supervisor, install_child_watcher
+from rpc import JsonRpcClient, JsonRpcError, is_address, wei_to_eth
+from etag import conditional_response, is_not_modified, make_etag, not_modified
+from proposal_store import ProposalQuery, ProposalStore, SQLiteProposalStore, decode_cursor, encode_cursor
 
 # --- Configuration ---
-INFURA_URL = "https://mainnet.infura.io/v3/2db6b9cd6ba745f3b98f07e264e57785"
+INFURA_URL = os.environ.get("MAYA_RPC_URL", "https://mainnet.infura.io/v3/2db6b9cd6ba745f3b98f07e264e57785")
 TREASURY_ADDRESS = "0x16B3d93d02FB58f7aCe79157E74Eb275D2c3F734" # The Vault
+DB_PATH = os.environ.get("MAYA_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "maya.db"))
+LOG_INDEX_PATH = os.environ.get("MAYA_LOG_INDEX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs.db"))
+# agents/faucet_harvester.py runs on this host and serves no /log; its claims are indexed from here.
+HARVESTER_LOG = os.environ.get("MAYA_HARVESTER_LOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "faucet_harvester.log"))
+HARVESTER_AGENT_ID = "harvester"
+TREASURY_REFRESH_SECS = float(os.environ.get("MAYA_TREASURY_REFRESH_SECS", "15"))  # Background refresh interval
+TREASURY_MAX_AGE_SECS = float(os.environ.get("MAYA_TREASURY_MAX_AGE_SECS", "60"))  # Older values are refetched inline
+SESSION_DB_PATH = os.environ.get("MAYA_SESSION_DB_PATH", DB_PATH)  # Empty keeps wallet sessions in memory only
+SESSION_TTL = float(os.environ.get("MAYA_SESSION_TTL_SECS", SESSION_TTL_SECS))
+PROPOSAL_BATCH_MAX = 1000  # Decisions accepted by one /proposals/batch call
 
 # --- The Royal Charter's Data Structures ---
 
@@ -22,109 +47,341 @@ class Proposal(BaseModel):
     cost_eth: float
     expected_monthly_revenue_eth: float
     status: str  # pending, awaiting_approval, funded, rejected
+    created_at: Optional[float] = None  # Epoch seconds
+
+class ProposalPage(BaseModel):
+    items: List[Proposal]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page; null on the last page
+
+class ProposalDecision(BaseModel):
+    proposal_id: str
+    decision: str = Field(..., regex="^(approve|reject)$")
+
+class ProposalBatchRequest(BaseModel):
+    decisions: List[ProposalDecision] = Field(..., max_items=PROPOSAL_BATCH_MAX)
+    atomic: bool = True  # All or nothing: one unknown id leaves every proposal unchanged
+
+class ProposalDecisionResult(BaseModel):
+    proposal_id: str
+    decision: str
+    applied: bool
+    error: Optional[str] = None  # not_found, or rolled_back when another item sank an atomic batch
+    proposal: Optional[Proposal] = None  # As it stands after the batch
+
+class ProposalBatchResult(BaseModel):
+    applied: int
+    failed: int
+    results: List[ProposalDecisionResult]
+
+class ProposalPlan(BaseModel):
+    balance_eth: float
+    committed_eth: float  # Approved proposals still awaiting their transaction
+    budget_eth: float     # balance_eth - committed_eth
+    method: str           # exact (dynamic programming) or greedy (large sets, or where it beat the rounded DP)
+    selected: List[Proposal]
+    total_cost_eth: float
+    total_monthly_revenue_eth: float
+    considered: int
+    deferred: int
 
 class Treasury(BaseModel):
     address: str
     balance_eth: float
+    block_number: Optional[int] = None  # Block the balance was read at, if it came from the chain
+    age_secs: Optional[float] = None    # Seconds since the balance was fetched
 
 # --- The Chancellor's Management Classes ---
 
+SEED_PROPOSALS = [
+    dict(
+        id="prop_001",
+        agent_id="A-01",
+        purpose="Claim testnet ETH to bootstrap initial operations.",
+        cost_eth=0.0,
+        expected_monthly_revenue_eth=0.1,
+        status="pending"
+    ),
+    dict(
+        id="prop_002",
+        agent_id="A-13",
+        purpose="Provide liquidity to DEX pools for fee generation.",
+        cost_eth=0.05,
+        expected_monthly_revenue_eth=0.5,
+        status="pending"
+    ),
+]
+
+DECISION_STATUSES = {"approve": "awaiting_approval", "reject": "rejected"}
+
 class ProposalManager:
     """Manages the lifecycle of agent proposals."""
-    def __init__(self):
-        self._proposals: Dict[str, Proposal] = {
-            "prop_001": Proposal(
-                id="prop_001",
-                agent_id="A-01",
-                purpose="Claim testnet ETH to bootstrap initial operations.",
-                cost_eth=0.0,
-                expected_monthly_revenue_eth=0.1,
-                status="pending"
-            ),
-            "prop_002": Proposal(
-                id="prop_002",
-                agent_id="A-13",
-                purpose="Provide liquidity to DEX pools for fee generation.",
-                cost_eth=0.05,
-                expected_monthly_revenue_eth=0.5,
-                status="pending"
+    def __init__(self, store: ProposalStore):
+        self._store = store
+        self._store.seed(SEED_PROPOSALS)  # No-op once the store holds proposals
+        self.version = 0  # Bumped on every mutation; feeds the listing ETags
+        self._version_lock = threading.Lock()  # Sync routes mutate from several worker threads
+
+    def list_proposals(self, cursor: Optional[str] = None, sort: str = "created", order: Optional[str] = None, limit: int = 50, **filters) -> ProposalPage:
+        """One keyset-paginated page of proposals; `filters` are ProposalQuery's filter fields."""
+        descending = order == "desc" if order else sort == "roi"  # Best ROI first unless asked otherwise
+        try:
+            after = decode_cursor(sort, cursor) if cursor else None
+            query = ProposalQuery(sort=sort, descending=descending, after=after, limit=limit + 1, **filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        rows = self._store.page(query)  # One extra row tells us whether another page exists
+        next_cursor = encode_cursor(sort, rows[limit - 1]) if len(rows) > limit else None
+        return ProposalPage(items=[Proposal(**p) for p in rows[:limit]], next_cursor=next_cursor)
+
+    def active_proposals(self) -> List[Dict[str, Any]]:
+        """Every proposal that still counts toward an agent's economics (all but rejected)."""
+        return [p for status in ("pending", "awaiting_approval", "funded") for p in self._store.list_by_status(status)]
+
+    def plan_funding(self, balance_eth: float) -> ProposalPlan:
+        """The pending proposals worth funding from what the treasury has left after approvals."""
+        committed = sum(p["cost_eth"] for p in self._store.list_by_status("awaiting_approval"))
+        budget = max(0.0, balance_eth - committed)
+        result = plan(self._store.list_by_status("pending"), budget)
+        return ProposalPlan(balance_eth=balance_eth, committed_eth=committed, budget_eth=budget, **result)
+
+    def decide_many(self, decisions: List[ProposalDecision], atomic: bool = True) -> ProposalBatchResult:
+        """Approve and reject many proposals in a single store transaction."""
+        seen = set()
+        for d in decisions:
+            if d.proposal_id in seen:
+                raise HTTPException(status_code=400, detail=f"Proposal {d.proposal_id} appears more than once")
+            seen.add(d.proposal_id)
+        changes = [(d.proposal_id, DECISION_STATUSES[d.decision]) for d in decisions]
+        rows = self._store.transition_many(changes, require_all=atomic)
+        rolled_back = atomic and None in rows
+        results = [
+            ProposalDecisionResult(
+                proposal_id=d.proposal_id,
+                decision=d.decision,
+                applied=row is not None and not rolled_back,
+                error="not_found" if row is None else "rolled_back" if rolled_back else None,
+                proposal=Proposal(**row) if row is not None else None,
             )
-        }
-
-    def get_pending_proposals(self) -> List[Proposal]:
-        return [p for p in self._proposals.values() if p.status == "pending"]
+            for d, row in zip(decisions, rows)
+        ]
+        applied = sum(r.applied for r in results)
+        if applied:
+            with self._version_lock:
+                self.version += 1
+            print(f"Batch of {len(decisions)} decisions applied to {applied} proposals by decree of the Sovereign.")
+        return ProposalBatchResult(applied=applied, failed=len(results) - applied, results=results)
+
+    def _transition(self, proposal_id: str, status: str) -> Proposal:
+        proposal = self._store.transition(proposal_id, status)
+        if proposal is None:
+            raise HTTPException(status_code=404, detail="Proposal not found")
+        with self._version_lock:
+            self.version += 1
+        return Proposal(**proposal)
 
     def approve_proposal(self, proposal_id: str) -> Proposal:
-        if proposal_id not in self._proposals:
-            raise HTTPException(status_code=404, detail="Proposal not found")
-        proposal = self._proposals[proposal_id]
-        proposal.status = "awaiting_approval"
+        proposal = self._transition(proposal_id, DECISION_STATUSES["approve"])
         print(f"Proposal {proposal_id} marked for approval. Awaiting transaction from Sovereign.")
         return proposal
 
     def reject_proposal(self, proposal_id: str) -> Proposal:
-        if proposal_id not in self._proposals:
-            raise HTTPException(status_code=404, detail="Proposal not found")
-        proposal = self._proposals[proposal_id]
-        proposal.status = "rejected"
+        proposal = self._transition(proposal_id, DECISION_STATUSES["reject"])
         print(f"Proposal {proposal_id} rejected by decree of the Sovereign.")
         return proposal
 
 class Treasurer:
-    """Manages the Digital Kingdom's treasury."""
-    def __init__(self):
+    """Manages the Digital Kingdom's treasury.
+
+    The balance is held in memory and refreshed by a background task; requests only
+    go upstream when the cached value is missing or older than `max_age`, and
+    concurrent misses share a single upstream call. All chain I/O is async, so a
+    slow node never occupies a worker thread.
+    """
+    def __init__(self, rpc: JsonRpcClient, refresh_interval: float = TREASURY_REFRESH_SECS, max_age: float = TREASURY_MAX_AGE_SECS):
         self._treasury = Treasury(
             address=TREASURY_ADDRESS,
             balance_eth=0.0012  # Default/fallback balance
         )
+        self.rpc = rpc
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self._fetched_at: Optional[float] = None  # time.monotonic() of the last live fetch
+        self.flight = SingleFlight("treasury")
+        self.version = 0  # Bumped whenever the balance changes; feeds the /treasury ETag
+        # Nothing touches the network until the background refresher runs,
+        # so the app can bind and serve before the chain is reachable.
+        self.rpc_status = "warming"  # warming -> ready | unavailable
+
+    async def _fetch_balance(self):
         try:
-            self.w3 = Web3(Web3.HTTPProvider(INFURA_URL))
-            # For web3.py v5.x use self.w3.isConnected()
-            # For web3.py v6.x, use: if not self.w3.provider.is_connected():
-            if not self.w3.isConnected():
-                print("Warning: Failed to connect to Infura. Treasury balance will be simulated.")
-                self.w3 = None # Ensure w3 is None if initial connection check fails
-            else:
-                print("Successfully connected to Infura. Live treasury balance will be attempted.")
-        except Exception as e:
-            print(f"Warning: Error connecting to Infura during init: {e}. Treasury balance will be simulated.")
-            self.w3 = None # Ensure w3 is None if connection failed
-
-    def get_treasury_info(self) -> Treasury:
-        # For web3.py v5.x use self.w3 and self.w3.isConnected()
-        # For web3.py v6.x, use: if self.w3 and self.w3.provider.is_connected():
-        if self.w3 and self.w3.isConnected(): 
-            try:
-                checksum_address = self.w3.toChecksumAddress(self._treasury.address)
-                balance_wei = self.w3.eth.getBalance(checksum_address)
-                balance_eth = self.w3.fromWei(balance_wei, 'ether')
-                self._treasury.balance_eth = float(balance_eth) # Update with live balance
-                print(f"Successfully fetched live balance from Infura: {self._treasury.balance_eth} ETH")
-            except Exception as e:
-                print(f"Error fetching balance from Infura: {e}. Returning last known or default balance.")
-        else:
-            print("Not connected to Infura or w3 provider not initialized. Using simulated/last known balance.")
-        return self._treasury
+            block_number, balance_wei = await self.rpc.batch([
+                ("eth_blockNumber", []),
+                ("eth_getBalance", [self._treasury.address, "latest"]),
+            ])
+            for result in (block_number, balance_wei):
+                if isinstance(result, JsonRpcError):
+                    raise result
+            balance_eth = wei_to_eth(int(balance_wei, 16))
+            if balance_eth != self._treasury.balance_eth:
+                self.version += 1
+            self._treasury = self._treasury.copy(update={
+                "balance_eth": balance_eth,  # Update with live balance
+                "block_number": int(block_number, 16),
+            })
+            self._fetched_at = time.monotonic()
+            if self.rpc_status != "ready":
+                print("Successfully connected to Infura. Live treasury balance will be served.")
+            self.rpc_status = "ready"
+        except (JsonRpcError, TypeError, ValueError) as e:
+            if self.rpc_status != "unavailable":
+                print(f"Warning: Error fetching balance from Infura: {e}. Keeping last known or default balance.")
+            self.rpc_status = "unavailable"
+
+    async def refresh(self):
+        """Fetch the live balance; callers arriving while a fetch is running wait for that one."""
+        await self.flight.do("balance", self._fetch_balance)
+
+    async def run_refresher(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    async def get_treasury_info(self) -> Treasury:
+        # Only refetch inline while the node is known to answer; otherwise serve what we have.
+        if self.rpc_status == "ready" and (self._fetched_at is None or time.monotonic() - self._fetched_at > self.max_age):
+            await self.refresh()
+        treasury = self._treasury
+        if self._fetched_at is None:
+            return treasury
+        return treasury.copy(update={"age_secs": round(time.monotonic() - self._fetched_at, 3)})
 
 # --- FastAPI App - The Chancellor's Office ---
 
 app = FastAPI(title="MAYA Core - The Chancellor's Office")
-proposal_manager = ProposalManager()
-treasurer = Treasurer()
+proposal_manager = ProposalManager(SQLiteProposalStore(DB_PATH))
+rpc_client = JsonRpcClient(INFURA_URL)
+treasurer = Treasurer(rpc_client)
+agent_client = AgentClient()
+fleet = Fleet(agent_client)
+log_hub = LogHub(fleet)
+log_index = LogIndex(LOG_INDEX_PATH)
+revenue = RevenueSeries()
+log_indexer = LogIndexer(fleet, log_index, listeners=[revenue.ingest], local_logs={HARVESTER_AGENT_ID: HARVESTER_LOG})
+supervisor = Supervisor(fleet, agent_client)
+scoring = ScoringEngine()
+probes = ProbeScheduler(fleet, agent_client, listeners=[scoring.on_probe])
+sessions = SessionStore(ttl=SESSION_TTL, path=SESSION_DB_PATH or None)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], allow_methods=["*"], allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+async def run_log_ingestion():
+    # Revenue is rebuilt from the index before new lines arrive, so nothing is counted twice.
+    await asyncio.get_event_loop().run_in_executor(None, revenue.load, log_index)
+    await log_indexer.run()
+
+@app.on_event("startup")
+async def start_background_tasks():
+    install_child_watcher()
+    # Warm-up runs in the background; nothing here may block the server from binding.
+    app.state.treasury_refresher = asyncio.create_task(treasurer.run_refresher())
+    app.state.fleet_warm_up = asyncio.create_task(fleet.warm_up())
+    app.state.log_indexer = asyncio.create_task(run_log_ingestion())
+    app.state.probe_scheduler = asyncio.create_task(probes.run())
+    app.state.session_sweeper = asyncio.create_task(sessions.run_sweeper())
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    app.state.treasury_refresher.cancel()
+    app.state.fleet_warm_up.cancel()
+    app.state.log_indexer.cancel()
+    app.state.probe_scheduler.cancel()
+    app.state.session_sweeper.cancel()
+    await probes.close()
+    await supervisor.stop_all()  # Before the client closes: agents are stopped through /kill
+    await log_hub.close()
+    await agent_client.close()
+    await rpc_client.close()
+    sessions.close()
+
 # --- Endpoint Definitions from the Charter ---
 
+@app.get("/ready")
+def get_readiness_route():
+    """Readiness per dependency; 503 until every dependency has finished warming up."""
+    dependencies = {
+        "rpc": {"status": treasurer.rpc_status},
+        "agents": fleet.readiness(),
+    }
+    ready = all(dep["status"] != "warming" for dep in dependencies.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "dependencies": dependencies},
+    )
+
+@app.get("/stats/coalescing")
+def get_coalescing_stats_route():
+    """Upstream calls made and calls saved by joining one already in flight, per layer."""
+    return {flight.name: flight.stats() for flight in (rpc_client.flight, treasurer.flight, agent_client.flight, score_refreshes)}
+
 class ProposalDecisionRequest(BaseModel):
     proposal_id: str
 
+SORT_PATTERN = "^(created|roi|cost)$"
+ORDER_PATTERN = "^(asc|desc)$"
+
+@app.get("/proposals", response_model=ProposalPage)
+def list_proposals_route(
+    status: Optional[str] = None,
+    agent_id: Optional[str] = None,
+    min_cost: Optional[float] = None,
+    max_cost: Optional[float] = None,
+    sort: str = Query("created", regex=SORT_PATTERN),
+    order: Optional[str] = Query(None, regex=ORDER_PATTERN),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    return proposal_manager.list_proposals(
+        cursor=cursor, sort=sort, order=order, limit=limit,
+        status=status, agent_id=agent_id, min_cost=min_cost, max_cost=max_cost,
+    )
+
 @app.get("/proposals/pending", response_model=List[Proposal])
-def get_pending_proposals_route():
-    return proposal_manager.get_pending_proposals()
+def get_pending_proposals_route(
+    request: Request,
+    agent_id: Optional[str] = None,
+    min_cost: Optional[float] = None,
+    max_cost: Optional[float] = None,
+    sort: str = Query("created", regex=SORT_PATTERN),
+    order: Optional[str] = Query(None, regex=ORDER_PATTERN),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+):
+    etag = make_etag("proposals/pending", proposal_manager.version, str(request.query_params))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    # Kept as a bare list for existing clients; the next page's cursor travels in a header.
+    page = proposal_manager.list_proposals(
+        cursor=cursor, sort=sort, order=order, limit=limit,
+        status="pending", agent_id=agent_id, min_cost=min_cost, max_cost=max_cost,
+    )
+    headers = {"ETag": etag}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return JSONResponse(content=jsonable_encoder(page.items), headers=headers)
+
+@app.get("/proposals/plan", response_model=ProposalPlan)
+async def get_proposal_plan_route(request: Request):
+    """Pending proposals to fund for the most expected monthly revenue within the cached treasury balance."""
+    treasury = await treasurer.get_treasury_info()
+    etag = make_etag("proposals/plan", proposal_manager.version, treasury.balance_eth)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    result = await asyncio.get_event_loop().run_in_executor(None, proposal_manager.plan_funding, treasury.balance_eth)
+    return JSONResponse(content=jsonable_encoder(result), headers={"ETag": etag})
 
 @app.post("/proposals/approve", response_model=Proposal)
 def approve_proposal_route(request: ProposalDecisionRequest):
@@ -134,37 +391,155 @@ def approve_proposal_route(request: ProposalDecisionRequest):
 def reject_proposal_route(request: ProposalDecisionRequest):
     return proposal_manager.reject_proposal(request.proposal_id)
 
+@app.post("/proposals/batch", response_model=ProposalBatchResult)
+def decide_proposals_route(request: ProposalBatchRequest):
+    """Approve and reject many proposals in one transaction, with a result per decision.
+
+    An atomic batch that names an unknown proposal changes nothing and answers 409."""
+    result = proposal_manager.decide_many(request.decisions, atomic=request.atomic)
+    if request.atomic and result.failed:
+        return JSONResponse(status_code=409, content=jsonable_encoder(result))
+    return result
+
 @app.get("/treasury", response_model=Treasury)
-def get_treasury_route():
-    return treasurer.get_treasury_info()
+async def get_treasury_route(request: Request):
+    treasury = await treasurer.get_treasury_info()
+    # Weak: block_number and age_secs drift without the balance changing.
+    etag = make_etag("treasury", treasurer.version, weak=True)
+    return conditional_response(request, etag, lambda: treasury)
 
 # --- Legacy & Agent-Facing Endpoints (To Be Refactored) ---
 
 @app.get("/agents/logs")
-def get_logs_route():
-    result = subprocess.run(
-        "curl -s http://localhost:8080/log",
-        shell=True, capture_output=True, text=True
+async def get_logs_route(request: Request, limit: int = FLEET_LOG_LIMIT):
+    result, fingerprint = await fleet.gather_logs(limit=limit)
+    # Weak: each agent's latency_ms differs per fetch while the lines stay the same.
+    etag = make_etag("agents/logs", limit, fingerprint, weak=True)
+    return conditional_response(request, etag, lambda: result)
+
+@app.get("/agents/logs/stream")
+async def stream_logs_route(request: Request, last_event_id: Optional[str] = None):
+    """Server-Sent Events: new fleet log lines as they appear, resumable via Last-Event-ID."""
+    resume_from = request.headers.get("last-event-id") or last_event_id
+
+    async def frames():
+        subscription = log_hub.subscribe(resume_from)
+        try:
+            async for frame in subscription:
+                if await request.is_disconnected():
+                    break
+                yield frame
+        finally:
+            await subscription.aclose()
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    if result.returncode != 0:
-        return {"logs": ["Agent unreachable"]}
+
+@app.get("/logs/search")
+def search_logs_route(
+    q: Optional[str] = None,
+    phrase: Optional[str] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    agent_id: Optional[str] = None,
+    event: Optional[str] = None,
+    before: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=LOG_SEARCH_MAX),
+):
+    """Indexed fleet log lines matching every term in `q` and the exact `phrase`, within
+    [`start`, `end`] epoch ms. Newest first; pass `next_before` as `before` for the next page."""
     try:
-        data = json.loads(result.stdout)
-        return data
-    except:
-        return {"logs": ["Failed to parse agent logs"]}
+        hits, next_before = log_index.search(
+            terms=q, phrase=phrase, start=start, end=end,
+            agent_id=agent_id, event=event, before=before, limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"hits": hits, "next_before": next_before}
+
+@app.get("/agents/ranking")
+async def get_agent_ranking_route(request: Request, limit: Optional[int] = Query(None, ge=1)):
+    """Agents sorted by ROI from the probe cache; never waits on an agent."""
+    etag = make_etag("agents/ranking", probes.version, limit)
+    return conditional_response(request, etag, lambda: {"agents": probes.ranking(limit)})
+
+_scored_proposals_version = None
+score_refreshes = SingleFlight("scores")  # Worker threads that see the same new version share one reload
+
+def refresh_scored_proposals(version: int):
+    global _scored_proposals_version
+    if version != _scored_proposals_version:
+        scoring.set_proposals(proposal_manager.active_proposals())
+        _scored_proposals_version = version
+
+@app.get("/agents/scores")
+def get_agent_scores_route(request: Request, limit: Optional[int] = Query(100, ge=1), agent_id: Optional[str] = None):
+    """Risk-adjusted scores from probe history and proposal economics, best first."""
+    version = proposal_manager.version
+    if version != _scored_proposals_version:
+        score_refreshes.call(version, lambda: refresh_scored_proposals(version))
+    etag = make_etag("agents/scores", scoring.version, limit, agent_id)
+    return conditional_response(request, etag, lambda: {"agents": scoring.ranking(limit=limit, agent_id=agent_id)})
+
+@app.get("/agents/{agent_id}/revenue")
+def get_agent_revenue_route(
+    agent_id: str,
+    resolution: str = Query("hour", regex="^(" + "|".join(REVENUE_ROLLUPS) + ")$"),
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+):
+    """Total revenue and per-bucket rollups for an agent; `start`/`end` are epoch ms."""
+    if agent_id not in fleet.agents and agent_id not in revenue:
+        raise HTTPException(status_code=404, detail=f"Unknown agent: {agent_id}")
+    return revenue.summary(agent_id, resolution=resolution, start=start, end=end)
+
+class AgentRunRequest(BaseModel):
+    agent_id: Optional[str] = None  # Generated (L-01, L-02, ...) when omitted
+    port: Optional[int] = None      # Next free port from MAYA_AGENT_BASE_PORT when omitted
+
+class AgentStopRequest(BaseModel):
+    agent_id: str
 
 @app.post("/agents/run")
-def start_agent_route():
-    return {"status": "success", "message": "Agent start command issued"}
+async def start_agent_route(request: Optional[AgentRunRequest] = None):
+    """Launch a local agent process under the supervisor and add it to the fleet."""
+    request = request or AgentRunRequest()
+    try:
+        agent = await supervisor.start(agent_id=request.agent_id, port=request.port)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"status": "success", "message": f"Agent {agent.agent_id} starting on port {agent.port}", "agent": agent.to_dict()}
+
+@app.post("/agents/stop")
+async def stop_agent_route(request: AgentStopRequest):
+    """Stop a supervised agent through its /kill; it is not restarted."""
+    try:
+        agent = await supervisor.stop(request.agent_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No supervised agent {request.agent_id}")
+    return {"status": "success", "agent": agent.to_dict()}
+
+@app.get("/agents/processes")
+def list_agent_processes_route():
+    return {"agents": supervisor.list()}
 
-# --- Wallet Endpoints (Placeholder Implementation) ---
+# --- Wallet Endpoints ---
 
 class WalletBalanceResponse(BaseModel):
     address: str
     balance_eth: float
     last_updated: str
 
+class WalletBalancesRequest(BaseModel):
+    addresses: List[str] = []  # Empty means the treasury plus every known agent wallet
+
+class WalletBalancesResponse(BaseModel):
+    balances: List[WalletBalanceResponse]
+    errors: Dict[str, str]  # address -> reason, for addresses the node could not answer
+
 class WalletConnectRequest(BaseModel):
     address: str
     chain_id: str
@@ -173,6 +548,7 @@ class WalletSessionResponse(BaseModel):
     status: str
     session_id: str
     address: str
+    expires_at: Optional[str] = None
 
 class WalletDisconnectResponse(BaseModel):
     status: str
@@ -181,34 +557,72 @@ class WalletSessionInfo(BaseModel):
     address: str
     chain_id: str
     connected_at: str
+    expires_at: Optional[str] = None
 
-@app.get("/wallet/balance")
-def get_wallet_balance_route(address: str):
-    return WalletBalanceResponse(
-        address=address,
-        balance_eth=0.0,
-        last_updated=time.strftime("%Y-%m-%d %H:%M:%S")
-    )
+def format_time(epoch: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(epoch))
+
+async def lookup_balances(addresses: List[str]) -> WalletBalancesResponse:
+    """Resolve every address through one batched eth_getBalance round trip."""
+    invalid = [address for address in addresses if not is_address(address)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid address: {invalid[0]}")
+    try:
+        balances = await rpc_client.get_balances(addresses)
+    except JsonRpcError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    last_updated = time.strftime("%Y-%m-%d %H:%M:%S")
+    response = WalletBalancesResponse(balances=[], errors={})
+    for address, wei in balances.items():
+        if isinstance(wei, JsonRpcError):
+            response.errors[address] = str(wei)
+        else:
+            response.balances.append(WalletBalanceResponse(
+                address=address,
+                balance_eth=wei_to_eth(wei),
+                last_updated=last_updated
+            ))
+    return response
+
+@app.get("/wallet/balance", response_model=WalletBalanceResponse)
+async def get_wallet_balance_route(address: str):
+    result = await lookup_balances([address])
+    if result.errors:
+        raise HTTPException(status_code=502, detail=result.errors[address])
+    return result.balances[0]
+
+@app.post("/wallet/balances", response_model=WalletBalancesResponse)
+async def get_wallet_balances_route(request: WalletBalancesRequest):
+    addresses = request.addresses or [TREASURY_ADDRESS, *fleet.wallets.values()]
+    return await lookup_balances(addresses)
 
 @app.post("/wallet/session/connect")
 def connect_wallet_route(request: WalletConnectRequest):
-    session_id = f"session_{int(time.time())}"
+    if not is_address(request.address):
+        raise HTTPException(status_code=400, detail=f"Invalid address: {request.address}")
+    session = sessions.create(request.address, request.chain_id)
     return WalletSessionResponse(
         status="connected",
-        session_id=session_id,
-        address=request.address
+        session_id=session.session_id,
+        address=session.address,
+        expires_at=format_time(session.expires_at)
     )
 
 @app.post("/wallet/session/disconnect")
 def disconnect_wallet_route(session_id: str):
+    sessions.remove(session_id)  # Idempotent: an unknown or expired session is already gone
     return WalletDisconnectResponse(status="disconnected")
 
 @app.get("/wallet/session/{session_id}")
 def get_wallet_session_route(session_id: str):
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
     return WalletSessionInfo(
-        address="0x0000000000000000000000000000000000000000",
-        chain_id="1",
-        connected_at=time.strftime("%Y-%m-%d %H:%M:%S")
+        address=session.address,
+        chain_id=session.chain_id,
+        connected_at=format_time(session.connected_at),
+        expires_at=format_time(session.expires_at)
     )
 
 # --- Server Startup ---
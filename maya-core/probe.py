@@ -0,0 +1,160 @@
+import asyncio
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from agent_client import AgentClient, AgentUnreachable
+from fleet import Fleet
+
+# --- Configuration ---
+PROBE_BASE_SECS = 30.0        # Interval for a newly seen (or failing) agent
+PROBE_MIN_SECS = 5.0          # Volatile agents are probed this often at most...
+PROBE_MAX_SECS = 600.0        # ...and stable ones at least this often
+PROBE_STABLE_DELTA = 0.05     # ROI moving less than this fraction counts as stable: interval doubles
+PROBE_VOLATILE_DELTA = 0.25   # ROI moving more than this fraction counts as volatile: interval halves
+PROBE_JITTER = 0.2            # +/- fraction applied to every interval so probes never align
+PROBE_TICK_SECS = 1.0         # How often the scheduler looks for agents that are due
+PROBE_TIMEOUT_SECS = 3.0
+
+
+ProbeListener = Callable[[str, Dict[str, Any]], None]
+
+
+def next_interval(interval: float, previous_roi: Optional[float], roi: float) -> float:
+    """Back off while ROI holds steady, tighten when it swings."""
+    if previous_roi is None:
+        return interval
+    change = abs(roi - previous_roi) / max(abs(previous_roi), 1e-9)
+    if change < PROBE_STABLE_DELTA:
+        return min(PROBE_MAX_SECS, interval * 2)
+    if change > PROBE_VOLATILE_DELTA:
+        return max(PROBE_MIN_SECS, interval / 2)
+    return interval
+
+
+class ProbeState:
+    """What the scheduler knows about one agent's `/probe`."""
+
+    def __init__(self, agent_id: str, due: float):
+        self.agent_id = agent_id
+        self.due = due
+        self.interval = PROBE_BASE_SECS
+        self.result: Optional[Dict[str, Any]] = None  # Last successful probe
+        self.status = "pending"
+        self.probed_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(
+            self.result or {},
+            agent_id=self.agent_id,
+            status=self.status,
+            probed_at=self.probed_at,
+            interval_secs=round(self.interval, 1),
+        )
+
+
+class ProbeScheduler:
+    """Probes every agent on its own jittered, adaptive schedule and keeps a ROI ranking.
+
+    The ranking is rebuilt lazily, at most once per batch of landed probes, so serving it
+    costs a list copy of cached rows however large the fleet; no request waits on an agent.
+    """
+
+    def __init__(self, fleet: Fleet, client: AgentClient, tick: float = PROBE_TICK_SECS, listeners: Sequence[ProbeListener] = ()):
+        self.fleet = fleet
+        self.client = client
+        self.tick = tick
+        self.listeners = list(listeners)  # Called with (agent_id, result) after each successful probe
+        self.version = 0
+        self._states: Dict[str, ProbeState] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._ranking: List[Dict[str, Any]] = []
+        self._ranking_version = -1
+
+    def _sync_agents(self, now: float):
+        for agent_id in self.fleet.agents:
+            if agent_id not in self._states:
+                # Spread first probes over a few seconds instead of a thundering herd.
+                self._states[agent_id] = ProbeState(agent_id, now + random.uniform(0, min(PROBE_BASE_SECS, 5.0)))
+        for agent_id in list(self._states):
+            if agent_id not in self.fleet.agents:
+                del self._states[agent_id]
+                self.version += 1
+
+    async def _probe(self, state: ProbeState):
+        url = self.fleet.agents.get(state.agent_id)
+        if url is None:
+            return
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                data = await self.client.get_json(url, "/probe", timeout=PROBE_TIMEOUT_SECS)
+                roi = float(data["roi_hrs"])
+                result = {
+                    "name": (data.get("opportunity") or {}).get("name"),
+                    "roi_hrs": roi,
+                    "cost": data.get("cost"),
+                    "runtime_hrs": data.get("runtime_hrs"),
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                }
+            except (AgentUnreachable, ValueError, KeyError, TypeError) as e:
+                state.status = "unreachable" if isinstance(e, AgentUnreachable) else "bad_response"
+                state.interval = PROBE_BASE_SECS
+            else:
+                previous = state.result["roi_hrs"] if state.result else None
+                state.interval = next_interval(state.interval, previous, roi)
+                state.result = result
+                state.status = "ok"
+                for listener in self.listeners:
+                    listener(state.agent_id, result)
+        self.fleet.record_status(state.agent_id, state.status)
+        state.probed_at = time.time()
+        state.due = time.monotonic() + state.interval * random.uniform(1 - PROBE_JITTER, 1 + PROBE_JITTER)
+
+    def _probe_done(self, agent_id: str, task: asyncio.Task):
+        self._in_flight.pop(agent_id, None)
+        self.version += 1
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Probe of {agent_id} failed: {task.exception()}")
+
+    def sweep_due(self) -> List[asyncio.Task]:
+        """Start a probe for every agent that is due and not already being probed.
+
+        Probes run as independent tasks, so one slow agent never holds back the schedule."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.fleet.max_in_flight)
+        now = time.monotonic()
+        self._sync_agents(now)
+        started = []
+        for state in self._states.values():
+            if state.due <= now and state.agent_id not in self._in_flight:
+                task = asyncio.ensure_future(self._probe(state))
+                task.add_done_callback(lambda t, agent_id=state.agent_id: self._probe_done(agent_id, t))
+                self._in_flight[state.agent_id] = task
+                started.append(task)
+        return started
+
+    def ranking(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Agents by ROI, best first, from cached probe results; rebuilt only after changes."""
+        if self._ranking_version != self.version:
+            ranked = [state.to_dict() for state in self._states.values()]
+            # Agents with a reading first, best ROI first; the rest keep a stable order at the end.
+            ranked.sort(key=lambda r: (r.get("roi_hrs") is None, -(r.get("roi_hrs") or 0.0), r["agent_id"]))
+            for position, row in enumerate(ranked, 1):
+                row["rank"] = position
+            self._ranking = ranked
+            self._ranking_version = self.version
+        return self._ranking[:limit] if limit else list(self._ranking)
+
+    async def close(self):
+        for task in list(self._in_flight.values()):
+            task.cancel()
+
+    async def run(self):
+        while True:
+            try:
+                self.sweep_due()
+            except Exception as e:
+                print(f"Probe sweep failed: {e}")
+            await asyncio.sleep(self.tick)
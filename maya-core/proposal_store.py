@@ -0,0 +1,346 @@
+import abc
+import base64
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Proposals cross this boundary as plain dicts with the fields of main.Proposal;
+# ProposalManager turns them into models.
+FIELDS = ("id", "agent_id", "purpose", "cost_eth", "expected_monthly_revenue_eth", "status")
+
+# Public sort key -> column. Every column has (column, id), (status, column, id) and (agent_id, column, id)
+# indexes, so any page is an index walk in sort order that stops at LIMIT, never a sort.
+SORT_COLUMNS = {"created": "created_at", "roi": "roi", "cost": "cost_eth"}
+# Sort key -> index per leading filter. `page` names its index: left to itself SQLite seeks a cost
+# range through the status/cost index and then sorts every row in the range by date or ROI.
+SORT_INDEXES = {
+    "created": {"agent_id": "idx_proposals_agent", "status": "idx_proposals_status_created", None: "idx_proposals_created"},
+    "roi": {"agent_id": "idx_proposals_agent_roi", "status": "idx_proposals_status_roi", None: "idx_proposals_roi"},
+    "cost": {"agent_id": "idx_proposals_agent_cost", "status": "idx_proposals_status_cost", None: "idx_proposals_cost"},
+}
+SQL_VARIABLES_MAX = 900  # Ids per IN (...) query, under SQLite's older 999-variable limit
+FREE_ROI = 1e18  # ROI stored for zero-cost proposals, so they sort above everything that costs ETH
+
+
+def roi_of(proposal: Dict[str, Any]) -> float:
+    cost = proposal["cost_eth"]
+    return proposal["expected_monthly_revenue_eth"] / cost if cost > 0 else FREE_ROI
+
+
+def encode_cursor(sort: str, proposal: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past `proposal` in `sort` order."""
+    raw = json.dumps([sort, proposal[SORT_COLUMNS[sort]], proposal["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(sort: str, cursor: str) -> Tuple[Any, str]:
+    """(sort value, id) from a cursor; raises ValueError if it is malformed or from another sort."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, proposal_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if cursor_sort != sort or not isinstance(value, (int, float)) or not isinstance(proposal_id, str):
+        raise ValueError("Cursor does not match the requested sort")
+    return value, proposal_id
+
+
+class ProposalQuery:
+    """Filters, sort and keyset position for one page of proposals."""
+
+    def __init__(
+        self,
+        status: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        min_cost: Optional[float] = None,
+        max_cost: Optional[float] = None,
+        sort: str = "created",
+        descending: bool = False,
+        after: Optional[Tuple[Any, str]] = None,
+        limit: int = 50,
+    ):
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        self.status = status
+        self.agent_id = agent_id
+        self.min_cost = min_cost
+        self.max_cost = max_cost
+        self.sort = sort
+        self.descending = descending
+        self.after = after
+        self.limit = limit
+
+    def matches(self, proposal: Dict[str, Any]) -> bool:
+        if self.status is not None and proposal["status"] != self.status:
+            return False
+        if self.agent_id is not None and proposal["agent_id"] != self.agent_id:
+            return False
+        if self.min_cost is not None and proposal["cost_eth"] < self.min_cost:
+            return False
+        if self.max_cost is not None and proposal["cost_eth"] > self.max_cost:
+            return False
+        if self.after is not None:
+            key = (proposal[SORT_COLUMNS[self.sort]], proposal["id"])
+            return key < tuple(self.after) if self.descending else key > tuple(self.after)
+        return True
+
+
+class ProposalStore(abc.ABC):
+    """Interface shared by the proposal stores."""
+
+    @abc.abstractmethod
+    def seed(self, proposals: Iterable[Dict[str, Any]]):
+        """Insert `proposals` only if the store is empty, so restarts keep existing state."""
+
+    @abc.abstractmethod
+    def get(self, proposal_id: str) -> Optional[Dict[str, Any]]:
+        """The proposal with `proposal_id`, or None."""
+
+    @abc.abstractmethod
+    def list_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """Proposals with `status`, oldest first."""
+
+    @abc.abstractmethod
+    def page(self, query: ProposalQuery) -> List[Dict[str, Any]]:
+        """Up to `query.limit` matching proposals in sort order, starting after `query.after`."""
+
+    @abc.abstractmethod
+    def add(self, proposal: Dict[str, Any]):
+        """Insert `proposal`, or replace the one with its id."""
+
+    @abc.abstractmethod
+    def transition(self, proposal_id: str, status: str) -> Optional[Dict[str, Any]]:
+        """Atomically set the status; returns the updated proposal, or None if it does not exist."""
+
+    @abc.abstractmethod
+    def transition_many(self, changes: Sequence[Tuple[str, str]], require_all: bool = True) -> List[Optional[Dict[str, Any]]]:
+        """Apply every (proposal_id, status) change in one transaction.
+
+        Returns each proposal as it stands afterwards, None for ids that do not exist. With
+        `require_all`, one missing id leaves every proposal unchanged.
+        """
+
+
+class InMemoryProposalStore(ProposalStore):
+    """Dict-backed store with a status index; nothing survives a restart. Meant for tests."""
+
+    def __init__(self):
+        self._proposals: Dict[str, Dict[str, Any]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}  # status -> ids, insertion ordered
+        self._lock = threading.Lock()
+
+    def seed(self, proposals):
+        with self._lock:
+            if not self._proposals:
+                for proposal in proposals:
+                    self._insert(proposal)
+
+    def get(self, proposal_id):
+        proposal = self._proposals.get(proposal_id)
+        return dict(proposal) if proposal else None
+
+    def list_by_status(self, status):
+        with self._lock:
+            proposals = [dict(self._proposals[pid]) for pid in self._by_status.get(status, ())]
+        return sorted(proposals, key=lambda p: (p["created_at"], p["id"]))
+
+    def page(self, query):
+        with self._lock:
+            ids = self._by_status.get(query.status, ()) if query.status is not None else self._proposals
+            matches = [dict(self._proposals[pid]) for pid in ids if query.matches(self._proposals[pid])]
+        column = SORT_COLUMNS[query.sort]
+        matches.sort(key=lambda p: (p[column], p["id"]), reverse=query.descending)
+        return matches[:query.limit]
+
+    def add(self, proposal):
+        with self._lock:
+            self._insert(proposal)
+
+    def _insert(self, proposal):
+        record = {field: proposal[field] for field in FIELDS}
+        record["created_at"] = proposal.get("created_at") or time.time()
+        record["roi"] = roi_of(record)
+        previous = self._proposals.get(record["id"])
+        if previous:
+            self._by_status[previous["status"]].pop(record["id"], None)
+        self._proposals[record["id"]] = record
+        self._by_status.setdefault(record["status"], {})[record["id"]] = None
+
+    def transition(self, proposal_id, status):
+        with self._lock:
+            proposal = self._proposals.get(proposal_id)
+            if proposal is None:
+                return None
+            self._by_status[proposal["status"]].pop(proposal_id, None)
+            proposal["status"] = status
+            self._by_status.setdefault(status, {})[proposal_id] = None
+            return dict(proposal)
+
+    def transition_many(self, changes, require_all=True):
+        with self._lock:
+            missing = any(pid not in self._proposals for pid, _ in changes)
+            if not (missing and require_all):
+                for proposal_id, status in changes:
+                    proposal = self._proposals.get(proposal_id)
+                    if proposal is not None:
+                        self._by_status[proposal["status"]].pop(proposal_id, None)
+                        proposal["status"] = status
+                        self._by_status.setdefault(status, {})[proposal_id] = None
+            return [dict(self._proposals[pid]) if pid in self._proposals else None for pid, _ in changes]
+
+
+class SQLiteProposalStore(ProposalStore):
+    """Persistent store in a WAL-mode SQLite file, indexed on status and agent_id."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # One connection shared across FastAPI's worker threads, serialized by a lock.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS proposals (
+                    id TEXT PRIMARY KEY,
+                    agent_id TEXT NOT NULL,
+                    purpose TEXT NOT NULL,
+                    cost_eth REAL NOT NULL,
+                    expected_monthly_revenue_eth REAL NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    roi REAL NOT NULL DEFAULT 0
+                );
+            """)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(proposals)")}
+            if "roi" not in columns:
+                # Databases created before ROI sorting existed.
+                self._conn.execute("ALTER TABLE proposals ADD COLUMN roi REAL NOT NULL DEFAULT 0")
+                self._conn.execute(
+                    "UPDATE proposals SET roi = CASE WHEN cost_eth > 0"
+                    " THEN expected_monthly_revenue_eth / cost_eth ELSE ? END", (FREE_ROI,)
+                )
+            self._conn.executescript("""
+                DROP INDEX IF EXISTS idx_proposals_status;
+                CREATE INDEX IF NOT EXISTS idx_proposals_status_created ON proposals (status, created_at, id);
+                CREATE INDEX IF NOT EXISTS idx_proposals_status_roi ON proposals (status, roi, id);
+                CREATE INDEX IF NOT EXISTS idx_proposals_status_cost ON proposals (status, cost_eth, id);
+                CREATE INDEX IF NOT EXISTS idx_proposals_agent ON proposals (agent_id, created_at, id);
+                CREATE INDEX IF NOT EXISTS idx_proposals_agent_roi ON proposals (agent_id, roi, id);
+                CREATE INDEX IF NOT EXISTS idx_proposals_agent_cost ON proposals (agent_id, cost_eth, id);
+                -- Listings without a status or agent filter.
+                CREATE INDEX IF NOT EXISTS idx_proposals_created ON proposals (created_at, id);
+                CREATE INDEX IF NOT EXISTS idx_proposals_roi ON proposals (roi, id);
+                CREATE INDEX IF NOT EXISTS idx_proposals_cost ON proposals (cost_eth, id);
+            """)
+
+    def close(self):
+        self._conn.close()
+
+    @staticmethod
+    def _row(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        return dict(row) if row is not None else None
+
+    def seed(self, proposals):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM proposals LIMIT 1").fetchone() is None:
+                    for proposal in proposals:
+                        self._insert(proposal)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _insert(self, proposal):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO proposals (id, agent_id, purpose, cost_eth, expected_monthly_revenue_eth, status, created_at, roi)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [proposal[field] for field in FIELDS] + [proposal.get("created_at") or time.time(), roi_of(proposal)],
+        )
+
+    def get(self, proposal_id):
+        with self._lock:
+            return self._row(self._conn.execute("SELECT * FROM proposals WHERE id = ?", (proposal_id,)).fetchone())
+
+    def list_by_status(self, status):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM proposals WHERE status = ? ORDER BY created_at, id", (status,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def page(self, query):
+        column = SORT_COLUMNS[query.sort]
+        clauses, params = [], []
+        for condition, value in (
+            ("status = ?", query.status),
+            ("agent_id = ?", query.agent_id),
+            ("cost_eth >= ?", query.min_cost),
+            ("cost_eth <= ?", query.max_cost),
+        ):
+            if value is not None:
+                clauses.append(condition)
+                params.append(value)
+        if query.after is not None:
+            clauses.append(f"({column}, id) {'<' if query.descending else '>'} (?, ?)")
+            params.extend(query.after)
+        direction = "DESC" if query.descending else "ASC"
+        # The sort-order index, led by the filter that narrows it most; cost bounds are checked
+        # on the rows it walks. A narrow cost range under another sort reads more rows before
+        # LIMIT fills, but never sorts the range.
+        lead = "agent_id" if query.agent_id is not None else "status" if query.status is not None else None
+        sql = (
+            f"SELECT * FROM proposals INDEXED BY {SORT_INDEXES[query.sort][lead]}"
+            + (" WHERE " + " AND ".join(clauses) if clauses else "")
+            + f" ORDER BY {column} {direction}, id {direction} LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, params + [query.limit]).fetchall()
+        return [dict(row) for row in rows]
+
+    def add(self, proposal):
+        with self._lock:
+            self._insert(proposal)
+
+    def transition(self, proposal_id, status):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("UPDATE proposals SET status = ? WHERE id = ?", (status, proposal_id))
+                row = self._conn.execute("SELECT * FROM proposals WHERE id = ?", (proposal_id,)).fetchone()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self._row(row)
+
+    def _select_ids(self, ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        rows = {}
+        for i in range(0, len(ids), SQL_VARIABLES_MAX):
+            chunk = ids[i:i + SQL_VARIABLES_MAX]
+            sql = f"SELECT * FROM proposals WHERE id IN ({','.join('?' * len(chunk))})"
+            rows.update((row["id"], dict(row)) for row in self._conn.execute(sql, chunk))
+        return rows
+
+    def transition_many(self, changes, require_all=True):
+        ids = [pid for pid, _ in changes]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = self._select_ids(ids)
+                if len(existing) == len(set(ids)) or not require_all:
+                    self._conn.executemany(
+                        "UPDATE proposals SET status = ? WHERE id = ?",
+                        [(status, pid) for pid, status in changes if pid in existing],
+                    )
+                    existing = self._select_ids(ids)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [existing.get(pid) for pid in ids]
@@ -0,0 +1,140 @@
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# --- Configuration ---
+REVENUE_EVENTS = ("profit", "claimed")  # session_complete repeats the claims as a total, so it is left out
+# Rollup name -> (bucket width in seconds, buckets retained)
+REVENUE_ROLLUPS = {
+    "minute": (60, 24 * 60),
+    "hour": (3600, 90 * 24),
+    "day": (86400, 5 * 365),
+}
+REVENUE_DEFAULT_BUCKETS = {"minute": 60, "hour": 48, "day": 30}  # Window returned when no range is given
+
+
+class Rollup:
+    """Fixed-width revenue buckets in a ring of parallel arrays.
+
+    Slot `b % capacity` holds bucket `b` (bucket = epoch ms // width); a slot whose stored
+    bucket number differs is stale and reads as empty, so nothing is ever shifted or cleared.
+    """
+
+    def __init__(self, width_secs: int, capacity: int):
+        self.width_ms = width_secs * 1000
+        self.capacity = capacity
+        self._buckets = array("q", [-1]) * capacity
+        self._sums = array("d", [0.0]) * capacity
+        self._counts = array("l", [0]) * capacity
+        self.oldest = -1
+        self.newest = -1
+
+    def add(self, ts: int, amount: float):
+        bucket = ts // self.width_ms
+        if bucket <= self.newest - self.capacity:
+            return  # Older than the retained window
+        slot = bucket % self.capacity
+        if self._buckets[slot] != bucket:
+            self._buckets[slot] = bucket
+            self._sums[slot] = 0.0
+            self._counts[slot] = 0
+        self._sums[slot] += amount
+        self._counts[slot] += 1
+        self.newest = max(self.newest, bucket)
+        self.oldest = bucket if self.oldest < 0 else min(self.oldest, bucket)
+
+    def series(self, start: Optional[int], end: Optional[int], default_buckets: int) -> List[Dict[str, Any]]:
+        """Buckets overlapping [start, end] epoch ms, oldest first, empty ones between events included."""
+        last = end // self.width_ms if end is not None else self.newest
+        first = start // self.width_ms if start is not None else last - default_buckets + 1
+        # Nothing before the first event or outside the ring is worth walking.
+        first = max(first, self.oldest, last - self.capacity + 1, self.newest - self.capacity + 1)
+        points = []
+        for bucket in range(first, last + 1):
+            slot = bucket % self.capacity
+            live = self._buckets[slot] == bucket
+            points.append({
+                "start": bucket * self.width_ms,
+                "revenue_eth": self._sums[slot] if live else 0.0,
+                "events": self._counts[slot] if live else 0,
+            })
+        return points
+
+
+class AgentRevenue:
+    """Running totals plus one Rollup per resolution for a single agent."""
+
+    def __init__(self):
+        self.total_eth = 0.0
+        self.events = 0
+        self.first_ts: Optional[int] = None
+        self.last_ts: Optional[int] = None
+        self.rollups = {name: Rollup(width, capacity) for name, (width, capacity) in REVENUE_ROLLUPS.items()}
+
+    def add(self, ts: int, amount: float):
+        self.total_eth += amount
+        self.events += 1
+        self.first_ts = ts if self.first_ts is None else min(self.first_ts, ts)
+        self.last_ts = ts if self.last_ts is None else max(self.last_ts, ts)
+        for rollup in self.rollups.values():
+            rollup.add(ts, amount)
+
+
+class RevenueSeries:
+    """Per-agent revenue aggregated from PROFIT and Claimed events as the log indexer sees them.
+
+    Reads cost O(buckets requested); the raw lines stay in the log index, which is also
+    what `load` replays to rebuild the series after a restart.
+    """
+
+    def __init__(self):
+        self._agents: Dict[str, AgentRevenue] = {}
+        self._lock = threading.Lock()
+
+    def ingest(self, records_by_agent: Dict[str, List[Dict[str, Any]]]):
+        self.add_events(
+            (agent_id, r["ts"], r["amount"])
+            for agent_id, records in records_by_agent.items()
+            for r in records
+            if r["event"] in REVENUE_EVENTS and r.get("amount") is not None and r["ts"] is not None
+        )
+
+    def add_events(self, events: Iterable[Tuple[str, int, float]]):
+        with self._lock:
+            for agent_id, ts, amount in events:
+                agent = self._agents.get(agent_id)
+                if agent is None:
+                    agent = self._agents[agent_id] = AgentRevenue()
+                agent.add(ts, amount)
+
+    def load(self, index):
+        """Rebuild from every revenue event already in `index` (a log_index.LogIndex)."""
+        self.add_events(index.events(REVENUE_EVENTS))
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._agents
+
+    def summary(
+        self,
+        agent_id: str,
+        resolution: str = "hour",
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        if resolution not in REVENUE_ROLLUPS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        with self._lock:
+            agent = self._agents.get(agent_id)
+            if agent is None:
+                return {"agent_id": agent_id, "total_eth": 0.0, "events": 0, "first_ts": None,
+                        "last_ts": None, "resolution": resolution, "buckets": []}
+            buckets = agent.rollups[resolution].series(start, end, REVENUE_DEFAULT_BUCKETS[resolution])
+            return {
+                "agent_id": agent_id,
+                "total_eth": agent.total_eth,
+                "events": agent.events,
+                "first_ts": agent.first_ts,
+                "last_ts": agent.last_ts,
+                "resolution": resolution,
+                "buckets": buckets,
+            }
@@ -0,0 +1,119 @@
+import asyncio
+import itertools
+import json
+import re
+from decimal import Decimal
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+from singleflight import SingleFlight
+
+# --- Configuration ---
+RPC_TIMEOUT_SECS = 10.0
+RPC_BATCH_LIMIT = 500   # Calls per JSON-RPC batch; larger requests are split and sent concurrently
+WEI_PER_ETH = Decimal(10) ** 18
+
+_ADDRESS_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")
+
+
+class JsonRpcError(Exception):
+    """An error object returned by the node, or a transport failure talking to it."""
+
+
+def is_address(address: str) -> bool:
+    return bool(_ADDRESS_RE.match(address))
+
+
+def wei_to_eth(wei: int) -> float:
+    return float(Decimal(wei) / WEI_PER_ETH)
+
+
+class JsonRpcClient:
+    """Async JSON-RPC 2.0 client over one pooled HTTP session, with batch support.
+
+    Identical batches (same methods and params) already on the wire are not sent twice;
+    later callers wait for the one in flight.
+    """
+
+    def __init__(self, url: str, timeout: float = RPC_TIMEOUT_SECS, batch_limit: int = RPC_BATCH_LIMIT):
+        self.url = url
+        self.timeout = timeout
+        self.batch_limit = batch_limit
+        self._ids = itertools.count(1)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.flight = SingleFlight("rpc")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _post(self, payload: Any) -> Any:
+        try:
+            async with self._get_session().post(self.url, json=payload) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            raise JsonRpcError(f"RPC transport error: {e!r}") from e
+
+    async def call(self, method: str, params: Sequence[Any] = ()) -> Any:
+        (result,) = await self.batch([(method, params)])
+        if isinstance(result, JsonRpcError):
+            raise result
+        return result
+
+    async def batch(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """Send `calls` as JSON-RPC batches; returns results in order, with a JsonRpcError per failed item."""
+        chunks = [calls[i:i + self.batch_limit] for i in range(0, len(calls), self.batch_limit)]
+        results = await asyncio.gather(*(self._coalesced_chunk(chunk) for chunk in chunks))
+        return [item for chunk in results for item in chunk]
+
+    def _coalesced_chunk(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> Awaitable[List[Any]]:
+        key = tuple((method, json.dumps(list(params))) for method, params in calls)
+        return self.flight.do(key, lambda: self._batch_chunk(calls))
+
+    async def _batch_chunk(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        requests = [
+            {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": list(params)}
+            for method, params in calls
+        ]
+        replies = await self._post(requests)
+        if not isinstance(replies, list):
+            # Nodes answer a rejected batch with a single error object.
+            error = (replies or {}).get("error") if isinstance(replies, dict) else None
+            raise JsonRpcError(f"Batch rejected: {error or replies!r}")
+        by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+        results: List[Any] = []
+        for request in requests:
+            reply = by_id.get(request["id"])
+            if reply is None:
+                results.append(JsonRpcError(f"No reply for {request['method']}"))
+            elif "error" in reply:
+                results.append(JsonRpcError(f"{request['method']}: {reply['error']}"))
+            else:
+                results.append(reply.get("result"))
+        return results
+
+    async def get_balances(self, addresses: Sequence[str], block: str = "latest") -> Dict[str, Any]:
+        """Wei balance per address from a single batched `eth_getBalance` round trip (per chunk).
+
+        Values are ints, or a JsonRpcError for addresses the node could not answer.
+        """
+        unique = list(dict.fromkeys(addresses))
+        results = await self.batch([("eth_getBalance", [address, block]) for address in unique])
+        return {address: _parse_quantity(result) for address, result in zip(unique, results)}
+
+
+def _parse_quantity(result: Any) -> Any:
+    if isinstance(result, JsonRpcError):
+        return result
+    try:
+        return int(result, 16)
+    except (TypeError, ValueError):
+        return JsonRpcError(f"Malformed quantity: {result!r}")
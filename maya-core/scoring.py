@@ -0,0 +1,148 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# --- Configuration ---
+SCORE_HISTORY = 64                  # Probe readings kept per agent
+SCORE_RISK_AVERSION = 1.0           # Risk-adjusted ROI = mean - this * stddev
+SCORE_PAYBACK_HORIZON_DAYS = 30.0   # A payback this long halves the score
+SCORE_INITIAL_CAPACITY = 1024       # Rows allocated up front; doubled as agents appear
+
+
+class ScoringEngine:
+    """Risk-adjusted opportunity scores for the whole fleet, computed in one NumPy pass.
+
+    Probe readings live in a (agents x SCORE_HISTORY) ring of `roi_hrs` values, NaN where
+    unfilled; proposal economics live in per-agent cost and revenue vectors. Scores are
+    recomputed only when either changes.
+    """
+
+    def __init__(self, history: int = SCORE_HISTORY, capacity: int = SCORE_INITIAL_CAPACITY):
+        self.history = history
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._roi = np.full((capacity, history), np.nan)
+        self._written = np.zeros(capacity, dtype=np.int64)  # Readings ever recorded per row
+        self._cost = np.zeros(capacity)
+        self._revenue = np.zeros(capacity)
+        self._lock = threading.Lock()
+        self.version = 0
+        self._computed_version = -1
+        self._computed: Optional[Dict[str, np.ndarray]] = None
+
+    def _row(self, agent_id: str) -> int:
+        row = self._rows.get(agent_id)
+        if row is not None:
+            return row
+        row = len(self._ids)
+        if row == len(self._written):
+            grow = len(self._written)
+            self._roi = np.vstack([self._roi, np.full((grow, self.history), np.nan)])
+            self._written = np.concatenate([self._written, np.zeros(grow, dtype=np.int64)])
+            self._cost = np.concatenate([self._cost, np.zeros(grow)])
+            self._revenue = np.concatenate([self._revenue, np.zeros(grow)])
+        self._rows[agent_id] = row
+        self._ids.append(agent_id)
+        return row
+
+    def record_probe(self, agent_id: str, roi_hrs: float):
+        with self._lock:
+            row = self._row(agent_id)
+            self._roi[row, self._written[row] % self.history] = roi_hrs
+            self._written[row] += 1
+            self.version += 1
+
+    def on_probe(self, agent_id: str, result: Dict[str, Any]):
+        """ProbeScheduler listener."""
+        self.record_probe(agent_id, result["roi_hrs"])
+
+    def record_probes(self, agent_ids: Sequence[str], roi_hrs: Sequence[float]):
+        """One reading each for many agents at once; `agent_ids` must be distinct."""
+        with self._lock:
+            rows = np.fromiter((self._row(agent_id) for agent_id in agent_ids), dtype=np.int64, count=len(agent_ids))
+            self._roi[rows, self._written[rows] % self.history] = roi_hrs
+            self._written[rows] += 1
+            self.version += 1
+
+    def set_proposals(self, proposals: Iterable[Dict[str, Any]]):
+        """Replace every agent's economics with the summed cost and revenue of `proposals`."""
+        proposals = list(proposals)
+        with self._lock:
+            rows = np.fromiter((self._row(p["agent_id"]) for p in proposals), dtype=np.int64, count=len(proposals))
+            self._cost[:] = 0.0
+            self._revenue[:] = 0.0
+            np.add.at(self._cost, rows, [p["cost_eth"] for p in proposals])
+            np.add.at(self._revenue, rows, [p["expected_monthly_revenue_eth"] for p in proposals])
+            self.version += 1
+
+    def compute(self) -> Dict[str, np.ndarray]:
+        """Per-agent columns, all aligned with `agent_ids`; cached until the inputs change."""
+        with self._lock:
+            if self._computed_version == self.version:
+                return self._computed
+            n = len(self._ids)
+            roi = self._roi[:n]
+            valid = ~np.isnan(roi)
+            samples = valid.sum(axis=1)
+            denom = np.maximum(samples, 1)
+            mean = np.where(valid, roi, 0.0).sum(axis=1) / denom
+            variance = np.where(valid, (roi - mean[:, None]) ** 2, 0.0).sum(axis=1) / denom
+            stddev = np.sqrt(variance)
+            # Unprobed agents have no statistics, so no score either.
+            mean = np.where(samples > 0, mean, np.nan)
+            stddev = np.where(samples > 0, stddev, np.nan)
+            cost = self._cost[:n].copy()
+            revenue = self._revenue[:n].copy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                daily = revenue / 30.0
+                # Free opportunities pay back at once; costly ones with no revenue never do.
+                payback_days = np.where(cost <= 0, 0.0, np.where(daily > 0, cost / daily, np.inf))
+                risk_adjusted = mean - SCORE_RISK_AVERSION * stddev
+                score = risk_adjusted / (1.0 + payback_days / SCORE_PAYBACK_HORIZON_DAYS)
+            self._computed = {
+                "agent_ids": np.array(self._ids, dtype=object),
+                "samples": samples,
+                "mean_roi": mean,
+                "stddev_roi": stddev,
+                "risk_adjusted_roi": risk_adjusted,
+                "cost_eth": cost,
+                "monthly_revenue_eth": revenue,
+                "payback_days": payback_days,
+                "score": score,
+            }
+            self._computed_version = self.version
+            return self._computed
+
+    def ranking(self, limit: Optional[int] = None, agent_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Agents by score, best first (unscored last); only the top `limit` are sorted."""
+        columns = self.compute()
+        score = columns["score"]
+        if agent_id is not None:
+            row = self._rows.get(agent_id)
+            order = np.array([row] if row is not None and row < len(score) else [], dtype=np.int64)
+        else:
+            keyed = np.where(np.isnan(score), -np.inf, score)
+            if limit and limit < len(keyed):
+                top = np.argpartition(-keyed, limit - 1)[:limit]
+                order = top[np.argsort(-keyed[top], kind="stable")]
+            else:
+                order = np.argsort(-keyed, kind="stable")
+        return [self._row_dict(columns, row) for row in order]
+
+    @staticmethod
+    def _row_dict(columns: Dict[str, np.ndarray], row: int) -> Dict[str, Any]:
+        def number(value):
+            return None if not np.isfinite(value) else float(value)
+
+        return {
+            "agent_id": columns["agent_ids"][row],
+            "samples": int(columns["samples"][row]),
+            "mean_roi": number(columns["mean_roi"][row]),
+            "stddev_roi": number(columns["stddev_roi"][row]),
+            "risk_adjusted_roi": number(columns["risk_adjusted_roi"][row]),
+            "cost_eth": float(columns["cost_eth"][row]),
+            "monthly_revenue_eth": float(columns["monthly_revenue_eth"][row]),
+            "payback_days": number(columns["payback_days"][row]),  # null: never pays back
+            "score": number(columns["score"][row]),
+        }
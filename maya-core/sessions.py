@@ -0,0 +1,131 @@
+import asyncio
+import heapq
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# --- Configuration ---
+SESSION_TTL_SECS = 24 * 3600     # A wallet session lives this long after connect
+SESSION_SWEEP_SECS = 60.0        # How often expired sessions are evicted in the background
+SESSION_ID_BYTES = 16            # Randomness in each session id (128 bits)
+
+
+class WalletSession:
+    """One connected wallet."""
+
+    __slots__ = ("session_id", "address", "chain_id", "connected_at", "expires_at")
+
+    def __init__(self, session_id: str, address: str, chain_id: str, connected_at: float, expires_at: float):
+        self.session_id = session_id
+        self.address = address
+        self.chain_id = chain_id
+        self.connected_at = connected_at  # Epoch seconds
+        self.expires_at = expires_at
+
+
+class SessionStore:
+    """Wallet sessions in a dict keyed by random id, expired through a min-heap of deadlines.
+
+    Lookups are one dict probe however many sessions are live. Disconnects leave their heap
+    entry behind to be skipped at eviction; the heap is rebuilt if those pile up. With a
+    `path`, every change is written through to SQLite and live sessions are reloaded on start.
+    """
+
+    def __init__(self, ttl: float = SESSION_TTL_SECS, path: Optional[str] = None):
+        self.ttl = ttl
+        self._sessions: Dict[str, WalletSession] = {}
+        self._expiry: List[Tuple[float, str]] = []  # (expires_at, session_id)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS wallet_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    address TEXT NOT NULL,
+                    chain_id TEXT NOT NULL,
+                    connected_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._load()
+
+    def _load(self):
+        now = time.time()
+        self._conn.execute("DELETE FROM wallet_sessions WHERE expires_at <= ?", (now,))
+        for row in self._conn.execute("SELECT session_id, address, chain_id, connected_at, expires_at FROM wallet_sessions"):
+            self._sessions[row[0]] = WalletSession(*row)
+            self._expiry.append((row[4], row[0]))
+        heapq.heapify(self._expiry)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, address: str, chain_id: str) -> WalletSession:
+        now = time.time()
+        with self._lock:
+            session_id = f"session_{secrets.token_urlsafe(SESSION_ID_BYTES)}"
+            while session_id in self._sessions:  # 128 random bits; this loop is for form's sake
+                session_id = f"session_{secrets.token_urlsafe(SESSION_ID_BYTES)}"
+            session = WalletSession(session_id, address, chain_id, now, now + self.ttl)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT INTO wallet_sessions (session_id, address, chain_id, connected_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (session_id, address, chain_id, session.connected_at, session.expires_at),
+                )
+            self._sessions[session_id] = session
+            heapq.heappush(self._expiry, (session.expires_at, session_id))
+        return session
+
+    def get(self, session_id: str) -> Optional[WalletSession]:
+        """The live session, or None if it never existed, was disconnected or has expired."""
+        session = self._sessions.get(session_id)
+        if session is None or session.expires_at <= time.time():
+            return None  # An expired one is left for the sweeper
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM wallet_sessions WHERE session_id = ?", (session_id,))
+            if len(self._expiry) > 2 * len(self._sessions) + 1024:
+                self._expiry = [(s.expires_at, s.session_id) for s in self._sessions.values()]
+                heapq.heapify(self._expiry)
+        return True
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """Drop every session past its deadline; returns how many were live until now."""
+        now = time.time() if now is None else now
+        evicted = 0
+        with self._lock:
+            while self._expiry and self._expiry[0][0] <= now:
+                expires_at, session_id = heapq.heappop(self._expiry)
+                session = self._sessions.get(session_id)
+                if session is not None and session.expires_at == expires_at:
+                    del self._sessions[session_id]
+                    evicted += 1
+            if evicted and self._conn is not None:
+                self._conn.execute("DELETE FROM wallet_sessions WHERE expires_at <= ?", (now,))
+        return evicted
+
+    async def run_sweeper(self, interval: float = SESSION_SWEEP_SECS):
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await loop.run_in_executor(None, self.evict_expired)
+            except sqlite3.Error as e:
+                print(f"Session sweep failed: {e}")
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
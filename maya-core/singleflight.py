@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """A sync call in progress; waiters block on `done`."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Collapses identical concurrent calls into one: whoever asks for `key` while a call for
+    it is running gets that call's result (or exception) instead of starting another.
+
+    `do` serves coroutines on the event loop, `call` serves plain functions across threads.
+    Nothing is cached; a key is free again the moment its call finishes.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0      # Upstream calls actually made
+        self.coalesced = 0  # Callers served by someone else's call: calls saved
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            # The call runs as its own task, so a caller that gives up (a fleet deadline, a
+            # dropped request) never cancels it for everyone else waiting on it.
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here, so a call nobody awaits any more is not reported as lost
+
+    def call(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if leader:
+            try:
+                flight.result = fn()
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._tasks) + len(self._flights),
+        }
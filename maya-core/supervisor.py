@@ -0,0 +1,191 @@
+import asyncio
+import os
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from agent_client import AgentClient, AgentUnreachable
+from fleet import Fleet
+
+# --- Configuration ---
+CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENT_SCRIPT = os.path.join(CORE_DIR, "agents", "faucet_harvester", "agent.py")
+AGENT_RUN_DIR = os.environ.get("MAYA_AGENT_RUN_DIR", os.path.join(CORE_DIR, "run"))  # One working dir per agent
+SUPERVISOR_BASE_PORT = int(os.environ.get("MAYA_AGENT_BASE_PORT", 9100))  # First port handed to a local agent
+SUPERVISOR_BACKOFF_SECS = 1.0      # First restart delay; doubles per consecutive crash...
+SUPERVISOR_BACKOFF_MAX_SECS = 60.0  # ...up to this
+SUPERVISOR_STABLE_SECS = 30.0      # A run this long resets the backoff
+SUPERVISOR_STOP_TIMEOUT_SECS = 10.0  # Wait after /kill (the agent exits ~5s later) before SIGTERM
+
+
+def install_child_watcher():
+    """Make the event loop wait on children through pidfds where it would otherwise use threads.
+
+    Before Python 3.12 the default child watcher parks one thread in waitpid() per child; 3.12+
+    and uvloop already avoid that, so this only acts on older stock asyncio on Linux.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return
+    if type(asyncio.get_event_loop_policy()) is not asyncio.DefaultEventLoopPolicy:
+        return
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(asyncio.get_event_loop())
+    asyncio.set_child_watcher(watcher)
+
+
+def port_is_free(port: int) -> bool:
+    with socket.socket() as s:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # As uvicorn binds; TIME_WAIT is fine
+        try:
+            s.bind(("0.0.0.0", port))
+        except OSError:
+            return False
+    return True
+
+
+class ManagedAgent:
+    """One locally launched agent process and its restart bookkeeping."""
+
+    def __init__(self, agent_id: str, port: int):
+        self.agent_id = agent_id
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+        self.state = "starting"  # starting, running, backoff, stopping, stopped
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+        self.crashes_in_a_row = 0
+        self.last_exit_code: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "agent_id": self.agent_id,
+            "port": self.port,
+            "url": self.url,
+            "state": self.state,
+            "pid": self.process.pid if self.process and self.process.returncode is None else None,
+            "uptime_secs": round(time.time() - self.started_at, 1) if self.started_at and self.state == "running" else None,
+            "restarts": self.restarts,
+            "last_exit_code": self.last_exit_code,
+        }
+
+
+class Supervisor:
+    """Launches agents as child processes, restarts crashed ones with exponential backoff,
+    and stops them through their own `/kill`.
+
+    Each agent costs one asyncio task (waiting on the process), not a thread.
+    """
+
+    def __init__(self, fleet: Fleet, client: AgentClient, script: str = AGENT_SCRIPT, run_dir: str = AGENT_RUN_DIR, base_port: int = SUPERVISOR_BASE_PORT):
+        self.fleet = fleet
+        self.client = client
+        self.script = script
+        self.run_dir = run_dir
+        self.base_port = base_port
+        self.agents: Dict[str, ManagedAgent] = {}
+        self._lock = asyncio.Lock()
+
+    def _next_port(self) -> int:
+        taken = {agent.port for agent in self.agents.values()}
+        port = self.base_port
+        while port in taken or not port_is_free(port):
+            port += 1
+        return port
+
+    def _next_id(self) -> str:
+        n = len(self.agents) + 1
+        while f"L-{n:02d}" in self.agents:
+            n += 1
+        return f"L-{n:02d}"
+
+    async def start(self, agent_id: Optional[str] = None, port: Optional[int] = None) -> ManagedAgent:
+        async with self._lock:
+            agent_id = agent_id or self._next_id()
+            existing = self.agents.get(agent_id)
+            if existing is not None and existing.state != "stopped":
+                raise ValueError(f"Agent {agent_id} is already {existing.state}")
+            if port is not None and any(a.port == port and a.state != "stopped" for a in self.agents.values()):
+                raise ValueError(f"Port {port} is already in use by another agent")
+            agent = ManagedAgent(agent_id, port if port is not None else self._next_port())
+            self.agents[agent_id] = agent
+            self.fleet.register(agent_id, agent.url)
+        agent.task = asyncio.ensure_future(self._supervise(agent))
+        return agent
+
+    async def _spawn(self, agent: ManagedAgent):
+        workdir = os.path.join(self.run_dir, agent.agent_id)
+        os.makedirs(workdir, exist_ok=True)
+        # Output goes to a file, so nothing has to drain a pipe per child.
+        with open(os.path.join(workdir, "agent.out"), "ab") as out:
+            agent.process = await asyncio.create_subprocess_exec(
+                sys.executable, self.script,
+                cwd=workdir,
+                # agent_log.py, shared with the core, lives in CORE_DIR rather than next to the script.
+                env=dict(os.environ, AGENT_PORT=str(agent.port), PYTHONPATH=os.pathsep.join(
+                    filter(None, (CORE_DIR, os.environ.get("PYTHONPATH"))))),
+                stdin=asyncio.subprocess.DEVNULL, stdout=out, stderr=asyncio.subprocess.STDOUT,
+                start_new_session=True,  # A Ctrl-C aimed at the core must not bypass stop()
+            )
+        agent.started_at = time.time()
+        agent.state = "running"
+
+    async def _supervise(self, agent: ManagedAgent):
+        while agent.state != "stopping":
+            try:
+                await self._spawn(agent)
+            except OSError as e:
+                print(f"Failed to launch agent {agent.agent_id}: {e}")
+                agent.last_exit_code = None
+            else:
+                agent.last_exit_code = await agent.process.wait()
+                if agent.state == "stopping":
+                    break
+                self.fleet.record_status(agent.agent_id, "exited")  # Not ready again until it answers
+                if time.time() - agent.started_at >= SUPERVISOR_STABLE_SECS:
+                    agent.crashes_in_a_row = 0
+            delay = min(SUPERVISOR_BACKOFF_MAX_SECS, SUPERVISOR_BACKOFF_SECS * 2 ** agent.crashes_in_a_row)
+            agent.crashes_in_a_row += 1
+            agent.state = "backoff"
+            print(f"Agent {agent.agent_id} exited ({agent.last_exit_code}); restarting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            if agent.state == "stopping":
+                break
+            agent.restarts += 1
+        agent.state = "stopped"
+
+    async def stop(self, agent_id: str) -> ManagedAgent:
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            raise KeyError(agent_id)
+        if agent.state in ("stopping", "stopped"):
+            return agent
+        agent.state = "stopping"
+        self.fleet.unregister(agent_id)
+        process = agent.process
+        if process is not None and process.returncode is None:
+            try:
+                await self.client.post_json(agent.url, "/kill")
+            except (AgentUnreachable, ValueError):
+                process.terminate()  # Not answering; skip the graceful path
+            try:
+                await asyncio.wait_for(process.wait(), SUPERVISOR_STOP_TIMEOUT_SECS)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        if agent.task is not None:
+            agent.task.cancel()  # Wakes it from a backoff sleep; the process is already gone
+            try:
+                await agent.task
+            except asyncio.CancelledError:
+                pass
+        agent.state = "stopped"
+        return agent
+
+    async def stop_all(self):
+        await asyncio.gather(*(self.stop(agent_id) for agent_id in list(self.agents)), return_exceptions=True)
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [agent.to_dict() for agent in self.agents.values()]
@@ -0,0 +1,80 @@
+"""The asyncio Harvester against local faucet stubs, and Retry-After parsing.
+
+Run from maya-core:  python -m pytest tests
+"""
+import asyncio
+import email.utils
+import os
+import sys
+import time
+
+import pytest
+
+CORE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CORE_DIR)
+sys.path.insert(0, os.path.join(CORE_DIR, "benchmarks"))
+sys.path.insert(0, os.path.join(CORE_DIR, "agents"))
+
+from agent_log import LogWriter, RotatingLog  # noqa: E402
+from faucet_harvester import Faucet, Harvester, parse_retry_after, random_wallet  # noqa: E402
+from log_records import parse_line  # noqa: E402
+from stubs import start_stub_faucet  # noqa: E402
+
+# More claims per faucet than the stub's one-second burst allowance, so overrunning it shows.
+WALLETS, FAUCETS, ROUNDS = 25, 2, 2
+RATE, COOLDOWN = 20.0, 0.2
+
+
+def harvest(tmp_path, assumed_rate, retry_after_date=False):
+    stubs, faucets = [], []
+    for i in range(FAUCETS):
+        url, server = start_stub_faucet(RATE, COOLDOWN, 0.01, retry_after_date=retry_after_date)
+        stubs.append(server)
+        faucets.append(Faucet(f"stub-{i}", url, rate_per_sec=assumed_rate, cooldown_secs=COOLDOWN))
+    log = LogWriter(RotatingLog(str(tmp_path / "harvest.log")))
+    try:
+        total = asyncio.run(Harvester(faucets, [random_wallet() for _ in range(WALLETS)], log, rounds=ROUNDS).run())
+    finally:
+        log.close()
+        for server in stubs:
+            server.shutdown()
+    records = [parse_line(line) for line in open(tmp_path / "harvest.log", encoding="utf-8")]
+    return faucets, stubs, total, records
+
+
+def test_every_claim_lands_at_the_faucets_real_rate(tmp_path):
+    faucets, stubs, total, records = harvest(tmp_path, assumed_rate=RATE)
+    assert sum(f.claims for f in faucets) == WALLETS * FAUCETS * ROUNDS
+    assert sum(f.failures for f in faucets) == 0
+    assert [s.stats["claims"] for s in stubs] == [WALLETS * ROUNDS] * FAUCETS
+    claimed = [r for r in records if r["event"] == "claimed"]
+    assert len(claimed) == WALLETS * FAUCETS * ROUNDS
+    assert total == pytest.approx(sum(r["amount"] for r in claimed))
+
+
+@pytest.mark.parametrize("retry_after_date", [False, True], ids=["seconds", "http-date"])
+def test_overrunning_the_faucet_still_lands_every_round(tmp_path, retry_after_date):
+    faucets, stubs, _, records = harvest(tmp_path, assumed_rate=3 * RATE, retry_after_date=retry_after_date)
+    assert sum(s.stats["rate_limited"] + s.stats["cooldown"] for s in stubs) > 0  # The 429 path was taken
+    assert sum(f.rate_limited for f in faucets) > 0
+    assert sum(f.claims for f in faucets) == WALLETS * FAUCETS * ROUNDS
+    assert sum(f.failures for f in faucets) == 0
+    assert not [r for r in records if r["event"] == "error"]
+
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after("5", 2.0) == 5.0
+    assert parse_retry_after("0.5", 2.0) == 0.5
+    assert parse_retry_after("-3", 2.0) == 0.0
+
+
+def test_parse_retry_after_http_date():
+    future = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 28.0 <= parse_retry_after(future, 2.0) <= 30.0
+    past = email.utils.formatdate(time.time() - 30, usegmt=True)
+    assert parse_retry_after(past, 2.0) == 0.0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "Thu, 99 Foo 2025 xx:yy:zz GMT"])
+def test_parse_retry_after_falls_back_on_missing_or_garbage(value):
+    assert parse_retry_after(value, 2.0) == 2.0
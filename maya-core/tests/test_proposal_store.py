@@ -0,0 +1,146 @@
+"""Both proposal stores behave the same through the ProposalStore interface.
+
+Run from maya-core:  python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proposal_store import (  # noqa: E402
+    InMemoryProposalStore, ProposalQuery, ProposalStore, SORT_COLUMNS, SQLiteProposalStore,
+)
+
+
+def proposal(i, **fields):
+    return dict({
+        "id": f"prop_{i:04d}", "agent_id": f"A-{i % 3:02d}", "purpose": "Test proposal.",
+        "cost_eth": 0.1, "expected_monthly_revenue_eth": 0.2, "status": "pending", "created_at": 1000.0 + i,
+    }, **fields)
+
+
+def random_proposals(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        proposal(
+            i,
+            cost_eth=rng.choice([0.0, 0.05, 0.1, round(rng.uniform(0, 1), 3)]),  # Ties and free ones on purpose
+            expected_monthly_revenue_eth=round(rng.uniform(0, 2), 3),
+            status=rng.choice(["pending", "awaiting_approval", "approved", "rejected"]),
+            created_at=1000.0 + rng.randrange(n // 2),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryProposalStore()
+    else:
+        store = SQLiteProposalStore(str(tmp_path / "maya.db"))
+        yield store
+        store.close()
+
+
+def test_store_is_abstract():
+    with pytest.raises(TypeError):
+        ProposalStore()
+
+
+def test_seed_fills_only_an_empty_store(store):
+    store.seed([proposal(1), proposal(2)])
+    store.seed([proposal(3)])
+    assert store.get("prop_0003") is None
+    assert [p["id"] for p in store.list_by_status("pending")] == ["prop_0001", "prop_0002"]
+
+
+def test_seed_does_not_reseed_after_everything_was_decided(store):
+    store.seed([proposal(1)])
+    store.transition("prop_0001", "approved")
+    store.seed([proposal(1)])
+    assert store.get("prop_0001")["status"] == "approved"
+
+
+def test_approvals_survive_reopening_the_database(tmp_path):
+    path = str(tmp_path / "maya.db")
+    store = SQLiteProposalStore(path)
+    store.seed([proposal(1), proposal(2), proposal(3)])
+    store.transition("prop_0001", "approved")
+    store.transition_many([("prop_0002", "rejected"), ("prop_0003", "awaiting_approval")])
+    store.close()
+
+    reopened = SQLiteProposalStore(path)
+    reopened.seed([proposal(1), proposal(2), proposal(3)])  # What a restart does
+    assert reopened.get("prop_0001")["status"] == "approved"
+    assert reopened.get("prop_0002")["status"] == "rejected"
+    assert reopened.get("prop_0003")["status"] == "awaiting_approval"
+    assert reopened.list_by_status("pending") == []
+    reopened.close()
+
+
+def walk(store, query):
+    ids, after = [], None
+    while True:
+        query.after = after
+        page = store.page(query)
+        ids.extend(p["id"] for p in page)
+        if len(page) < query.limit:
+            return ids
+        after = (page[-1][SORT_COLUMNS[query.sort]], page[-1]["id"])
+
+
+@pytest.mark.parametrize("sort", sorted(SORT_COLUMNS))
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("filters", [
+    {},
+    {"status": "pending"},
+    {"agent_id": "A-01"},
+    {"min_cost": 0.05, "max_cost": 0.5},
+    {"status": "approved", "min_cost": 0.1},
+    {"agent_id": "A-02", "max_cost": 0.1},
+])
+def test_keyset_pages_match_between_stores(tmp_path, sort, descending, filters):
+    proposals = random_proposals(300)
+    memory, sqlite = InMemoryProposalStore(), SQLiteProposalStore(str(tmp_path / "maya.db"))
+    for store in (memory, sqlite):
+        store.seed(proposals)
+    expected = [
+        p["id"] for p in sorted(
+            (dict(p, roi=memory.get(p["id"])["roi"]) for p in proposals if ProposalQuery(**filters).matches(p)),
+            key=lambda p: (p[SORT_COLUMNS[sort]], p["id"]), reverse=descending,
+        )
+    ]
+    for store in (memory, sqlite):
+        assert walk(store, ProposalQuery(sort=sort, descending=descending, limit=7, **filters)) == expected
+    sqlite.close()
+
+
+def test_transition_many_rolls_back_when_an_id_is_missing(store):
+    store.seed([proposal(1), proposal(2)])
+    rows = store.transition_many([("prop_0001", "approved"), ("prop_missing", "approved"), ("prop_0002", "rejected")])
+    assert rows[1] is None
+    assert [row["status"] for row in (rows[0], rows[2])] == ["pending", "pending"]
+    assert [p["status"] for p in (store.get("prop_0001"), store.get("prop_0002"))] == ["pending", "pending"]
+
+
+def test_transition_many_applies_what_exists_without_require_all(store):
+    store.seed([proposal(1), proposal(2)])
+    rows = store.transition_many([("prop_0001", "approved"), ("prop_missing", "approved")], require_all=False)
+    assert rows[0]["status"] == "approved" and rows[1] is None
+    assert store.get("prop_0001")["status"] == "approved"
+    assert store.get("prop_0002")["status"] == "pending"
+
+
+def test_transition_many_rolls_back_a_failed_write(tmp_path):
+    store = SQLiteProposalStore(str(tmp_path / "maya.db"))
+    store.seed([proposal(1), proposal(2)])
+    with pytest.raises(Exception):
+        store.transition_many([("prop_0001", "approved"), ("prop_0002", None)])  # status is NOT NULL
+    assert store.get("prop_0001")["status"] == "pending"
+    store.transition("prop_0002", "approved")  # The connection is usable again
+    assert store.get("prop_0002")["status"] == "approved"
+    store.close()